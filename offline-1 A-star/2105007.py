@@ -1,10 +1,37 @@
 from N_Puzzle import N_Puzzle
+from PackedPuzzle import PackedPuzzle
 from heuristics import hamming_distance, manhattan_distance, euclidean_distance, linear_conflict
-from PQueue import PriorityQueue
+from pattern_db import pattern_database
+from walking_distance import walking_distance
+from PQueue import IndexedPriorityQueue, BucketQueue
+from search import a_star, ida_star, bidirectional_a_star, compact_a_star, weighted_a_star, ara_star, sma_star
+from instrumented_search import instrumented_a_star, profile_json
+from hda_star import hda_star
+import sys
+import time
 
-#define the heuristic
+#define the heuristic (pattern_database and walking_distance build their tables into pdb_cache/
+#on first use, walking_distance only up to 4x4)
 h_n = euclidean_distance
 
+#define the state backend : N_Puzzle (list of lists) or PackedPuzzle (flat bytes)
+Puzzle = PackedPuzzle
+
+#define the search : a_star, ida_star (memory grows only with the solution depth)
+#bidirectional_a_star (searches from both ends, heuristics.py functions only)
+#compact_a_star (search tree in flat arrays instead of node objects)
+#weighted_a_star (g + 2h, fast but up to 2x longer paths)
+#ara_star (anytime : improving paths until optimal or out of time_limit seconds)
+#sma_star (at most 100000 nodes in memory, forgets the worst leaves when full)
+#hda_star (hash distributed A* : one process per core, each owning a share of the boards)
+#or instrumented_a_star (a_star that also prints where its time went as JSON)
+solver = a_star
+time_limit = None
+
+#define the open list of a_star : IndexedPriorityQueue, or BucketQueue (f buckets, lowest h first)
+#for the integer heuristics (all but euclidean_distance)
+open_list = IndexedPriorityQueue
+
 #Take input
 k = int(input("enter matrix size then the elements\n"))
 n = k*k
@@ -18,54 +45,22 @@ for i in range(k):
 
 
 #Driver code
-initial_state = N_Puzzle(matrix)
-if not(initial_state.is_solvable()):
+initial_state = Puzzle(matrix)
+solver_options = {"open_list" : open_list} if solver in (a_star, instrumented_a_star) else {}
+if time_limit is not None:
+    solver_options["deadline"] = time.perf_counter() + time_limit
+stats = {}
+states_path, explored, expanded = solver(initial_state, h_n, stats=stats, **solver_options)
+if states_path is None:
     print("Unsolvable puzzle")
 
 else:
-    pqueue = PriorityQueue()
-    pqueue.push(0, initial_state)
-
-    # open_list : list[N_Puzzle] = []
-    #closed_list : list[N_Puzzle] = []
-    closed_set: set = set()  # To store string representations of grids
-    i = 0
-    explored = 0
-    expanded = 0
-    while pqueue.size() != 0:
-        # i += 1
-        # print(f"iteration number : {i}")
-        _, curr_state = pqueue.pop()
-        #closed_list.append(curr_state)
-        closed_set.add(str(curr_state.grid))
-        expanded += 1
-        #print(curr_state)
-        if(curr_state.is_correct_config()):
-            break
-        
-        possible_configs = curr_state.generate_config()
-        for config in possible_configs:
-            nei_puzzle = N_Puzzle(config)
-            nei_puzzle.moves_count = curr_state.moves_count + 1
-            nei_puzzle.priority = nei_puzzle.moves_count + h_n(nei_puzzle.grid)
-            nei_puzzle.parent = curr_state
-            if str(nei_puzzle.grid) not in closed_set:
-                pqueue.push(nei_puzzle.priority, nei_puzzle)
-                explored += 1
-
-
-    print(f"\nMinimum number of moves =  {curr_state.moves_count}\n")
-
-    #Construct path from nodes
-    states_path = []
-    while curr_state.parent is not None:
-        states_path.append(curr_state)
-        curr_state = curr_state.parent
-    states_path.append(curr_state)
-    states_path = states_path[::-1]
+    print(f"\nMinimum number of moves =  {len(states_path) - 1}\n")
 
-    for state in states_path:
-        print(state)
+    #one write for the whole path instead of one print per state
+    sys.stdout.write(''.join(str(state) + '\n' for state in states_path))
 
     print("Explored : ", explored)
-    print("Expanded : ", expanded)
\ No newline at end of file
+    print("Expanded : ", expanded)
+    if solver is instrumented_a_star:
+        print(profile_json(stats))
\ No newline at end of file
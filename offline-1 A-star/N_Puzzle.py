@@ -1,81 +1,71 @@
-from helper import Count_Inversion
-import copy
+from solvability import is_solvable_tiles
+from PackedPuzzle import neighbor_table
+import itertools
 
 class N_Puzzle:
-    def __init__(self, initial_grid : list[list[int]], parent : 'N_Puzzle' = None):
+    def __init__(self, initial_grid : list[list[int]], parent : 'N_Puzzle' = None, blank : int = None):
         self.grid = initial_grid
         self.moves_count = 0
         self.parent = parent
         self.k = len(initial_grid)
         self.priority = 0
+        self.h_value = 0
+        #flat index of the blank, scanned for only once : children get it from their parent's move
+        self.blank = self.find_blank() if blank is None else blank
+        self._tiles = None
 
-    def get_blank_index(self):
+    #flat row major view, shared with PackedPuzzle so heuristics can take either. Built on first
+    #use and kept : the heuristic update, the closed set key and the goal test all read it, and
+    #the grid never changes once the node exists
+    @property
+    def tiles(self) -> tuple[int, ...]:
+        if self._tiles is None:
+            self._tiles = tuple(itertools.chain.from_iterable(self.grid))
+        return self._tiles
+
+    def find_blank(self) -> int:
         for i, row in enumerate(self.grid):
             for j, val in enumerate(row):
                 if val == 0:
-                   return i,j
+                   return i * self.k + j
+
+    def get_blank_index(self):
+        return divmod(self.blank, self.k)
 
+    #one grid per blank move (up, down, left, right), looked up in the neighbor table
     def generate_config(self):
         row_blank, col_blank = self.get_blank_index()
         valid_configs = []
-        #up move allowed
-        if(row_blank > 0):
-            new_grid_up = copy.deepcopy(self.grid)
-            target_num = new_grid_up[row_blank-1][col_blank]
-            new_grid_up[row_blank][col_blank] = target_num
-            new_grid_up[row_blank-1][col_blank] = 0
-            valid_configs.append(new_grid_up)
-
-        #down move allowed
-        if(row_blank < (self.k - 1)):
-            new_grid_down = copy.deepcopy(self.grid)
-            target_num = new_grid_down[row_blank + 1][col_blank]
-            new_grid_down[row_blank][col_blank] = target_num
-            new_grid_down[row_blank + 1][col_blank] = 0
-            valid_configs.append(new_grid_down)
-            
+        for target in neighbor_table(self.k)[self.blank]:
+            row_target, col_target = divmod(target, self.k)
+            new_grid = [row[:] for row in self.grid]
+            new_grid[row_blank][col_blank] = new_grid[row_target][col_target]
+            new_grid[row_target][col_target] = 0
+            valid_configs.append(new_grid)
 
-        #left move allowed
-        if(col_blank > 0):
-            new_grid_left = copy.deepcopy(self.grid)
-            target_num = new_grid_left[row_blank][col_blank - 1]
-            new_grid_left[row_blank][col_blank] = target_num
-            new_grid_left[row_blank][col_blank - 1] = 0
-            valid_configs.append(new_grid_left)
-            
-        #right move allowed
-        if(col_blank < (self.k - 1)):
-            new_grid_right = copy.deepcopy(self.grid)
-            target_num = new_grid_right[row_blank][col_blank + 1]
-            new_grid_right[row_blank][col_blank] = target_num
-            new_grid_right[row_blank][col_blank + 1] = 0
-            valid_configs.append(new_grid_right)
-        
         return valid_configs
+
+    #skip : a blank position not to move to (the parent's, the move back only undoes the last one)
+    def generate_children(self, skip : int = -1) -> list['N_Puzzle']:
+        children = []
+        targets = neighbor_table(self.k)[self.blank]
+        for target, config in zip(targets, self.generate_config()):
+            if target == skip:
+                continue
+            child = N_Puzzle(config, self, target)
+            child.moves_count = self.moves_count + 1
+            children.append(child)
+        return children
     
     def is_correct_config(self) -> bool:
-        flattened_grid = [item for row in self.grid for item in row]
-        for i, val in enumerate(flattened_grid):
+        for i, val in enumerate(self.tiles):
             if(i + 1 != val and val != 0):
                 return False
         
         return True
     
     def is_solvable(self) -> bool:
-        
-        k = len(self.grid)
-        flattened_grid = [item for arr in self.grid for item in arr]
-        blank_index = flattened_grid.index(0)
-        flattened_grid.pop(blank_index)
-        _, inversions = Count_Inversion(flattened_grid)
-        #print("number of inversions : ", inversions)
-        
-        # k odd
-        if(k % 2):
-            return not(inversions % 2)
-        else:
-            blank_index_from_bottom = k - (blank_index // 2)
-            return bool((blank_index_from_bottom % 2) ^ (inversions % 2))
+        return is_solvable_tiles(self.tiles)
 
     
     def __str__(self):
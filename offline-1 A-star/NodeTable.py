@@ -0,0 +1,49 @@
+from array import array
+
+#blank moves coded in 2 bits, same order as generate_config : up, down, left, right
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+
+def move_offsets(k : int) -> list[int]:
+    return [-k, k, -1, 1]
+
+
+#Search tree kept as flat arrays instead of N_Puzzle objects : node i has a parent index,
+#the 2 bit blank move that produced it (4 per byte) and its moves_count.
+#About 6.25 bytes per node and no boards : a path is rebuilt by replaying its moves from the start.
+class NodeTable:
+    def __init__(self):
+        self.parents = array('i')
+        self.g = array('H')
+        self.moves = bytearray()
+
+    def __len__(self):
+        return len(self.parents)
+
+    def add(self, parent : int, move : int, g : int) -> int:
+        index = len(self.parents)
+        if not(index & 3):
+            self.moves.append(0)
+        self.moves[index >> 2] |= move << ((index & 3) << 1)
+        self.parents.append(parent)
+        self.g.append(g)
+        return index
+
+    def move(self, index : int) -> int:
+        return (self.moves[index >> 2] >> ((index & 3) << 1)) & 3
+
+    #moves from the root (parent -1) down to index
+    def path_moves(self, index : int) -> list[int]:
+        moves = []
+        while self.parents[index] != -1:
+            moves.append(self.move(index))
+            index = self.parents[index]
+        return moves[::-1]
+
+    #blank positions visited after the start when the moves are replayed
+    def blank_path(self, index : int, blank : int, k : int) -> list[int]:
+        offsets = move_offsets(k)
+        blanks = []
+        for move in self.path_moves(index):
+            blank += offsets[move]
+            blanks.append(blank)
+        return blanks
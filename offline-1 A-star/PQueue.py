@@ -22,4 +22,146 @@ class PriorityQueue:
     def size(self):
         return len(self.heap)
 
-        
\ No newline at end of file
+        
+
+#Binary heap with one entry per key : pushing a key that is already queued moves its entry
+#instead of adding a duplicate, so the heap size is the real open set size
+class IndexedPriorityQueue:
+    def __init__(self):
+        self.heap = []          # entries [priority, count, key, item], compared up to the unique count
+        self.position = {}      # key -> index of its entry in heap
+        self.counter = itertools.count()  #to distinguish if priority same
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, key):
+        return key in self.position
+
+    def size(self):
+        return len(self.heap)
+
+    def get(self, key) -> 'N_Puzzle':
+        return self.heap[self.position[key]][3]
+
+    def priority(self, key):
+        return self.heap[self.position[key]][0]
+
+    #insert, or replace the queued item for key (decrease-key / increase-key), O(log n)
+    def push(self, priority : int, item : 'N_Puzzle', key):
+        entry = [priority, next(self.counter), key, item]
+        index = self.position.get(key)
+        if index is None:
+            self.heap.append(entry)
+            self._sift_up(len(self.heap) - 1)
+        else:
+            self.heap[index] = entry
+            self._sift_up(index)
+            self._sift_down(self.position[key])
+
+    def pop(self) -> tuple[int, 'N_Puzzle']:
+        if not self.heap:
+            raise IndexError("pop from an empty priority queue")
+        top = self.heap[0]
+        last = self.heap.pop()
+        del self.position[top[2]]
+        if self.heap:
+            self.heap[0] = last
+            self.position[last[2]] = 0
+            self._sift_down(0)
+        return top[0], top[3]
+
+    def _sift_up(self, index):
+        heap = self.heap
+        entry = heap[index]
+        while index > 0:
+            parent = (index - 1) >> 1
+            if heap[parent] <= entry:
+                break
+            heap[index] = heap[parent]
+            self.position[heap[index][2]] = index
+            index = parent
+        heap[index] = entry
+        self.position[entry[2]] = index
+
+    def _sift_down(self, index):
+        heap = self.heap
+        size = len(heap)
+        entry = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]:
+                break
+            heap[index] = heap[child]
+            self.position[heap[index][2]] = index
+            index = child
+        heap[index] = entry
+        self.position[entry[2]] = index
+
+
+#Open list for integer priorities : one bucket per f value, O(1) push and pop.
+#Inside a bucket the entry with the lowest h (item.h_value) comes out first, or the newest
+#one with tie_break="lifo". Same interface as IndexedPriorityQueue; a re-pushed key leaves
+#its old entry behind, which is skipped when it reaches the front.
+class BucketQueue:
+    def __init__(self, tie_break : str = "low_h"):
+        self.low_h = tie_break == "low_h"
+        self.buckets = []       # buckets[f] : stacks indexed by h (low_h) or a single stack
+        self.min_h = []         # min_h[f] : no non empty stack of buckets[f] below this h
+        self.items = {}         # key -> queued item
+        self.min_f = 0
+
+    def __len__(self):
+        return len(self.items)
+
+    def __contains__(self, key):
+        return key in self.items
+
+    def size(self):
+        return len(self.items)
+
+    def get(self, key) -> 'N_Puzzle':
+        return self.items[key]
+
+    def push(self, priority : int, item : 'N_Puzzle', key):
+        self.items[key] = item
+        while len(self.buckets) <= priority:
+            self.buckets.append([])
+            self.min_h.append(0)
+        bucket = self.buckets[priority]
+        if self.low_h:
+            h = item.h_value
+            while len(bucket) <= h:
+                bucket.append([])
+            bucket[h].append((key, item))
+            self.min_h[priority] = min(self.min_h[priority], h)
+        else:
+            bucket.append((key, item))
+        self.min_f = min(self.min_f, priority)
+
+    def pop(self) -> tuple[int, 'N_Puzzle']:
+        while self.items:
+            bucket = self.buckets[self.min_f]
+            if self.low_h:
+                h = self.min_h[self.min_f]
+                while h < len(bucket) and not bucket[h]:
+                    h += 1
+                self.min_h[self.min_f] = h
+                if h == len(bucket):
+                    self.min_f += 1
+                    continue
+                key, item = bucket[h].pop()
+            else:
+                if not bucket:
+                    self.min_f += 1
+                    continue
+                key, item = bucket.pop()
+            #skip entries replaced by a later push of the same key
+            if self.items.get(key) is item:
+                del self.items[key]
+                return self.min_f, item
+        raise IndexError("pop from an empty priority queue")
@@ -0,0 +1,114 @@
+from solvability import is_solvable_tiles, Unsupported
+import math
+
+#largest board whose tiles (0 .. k*k-1) all fit in a byte
+MAX_PACKED_K = 16
+
+#goal layout per board size : 1, 2, ..., n-1, blank
+_goal_tiles : dict[int, bytes] = {}
+
+def goal_tiles(k : int) -> bytes:
+    goal = _goal_tiles.get(k)
+    if goal is None:
+        goal = bytes(range(1, k * k)) + b'\x00'
+        _goal_tiles[k] = goal
+    return goal
+
+#flat indices the blank can move to from every cell, same order as N_Puzzle : up, down, left, right.
+#Built once per board size so successor generation is a lookup instead of four bound checks.
+_neighbor_tables : dict[int, tuple[tuple[int, ...], ...]] = {}
+
+def neighbor_table(k : int) -> tuple[tuple[int, ...], ...]:
+    table = _neighbor_tables.get(k)
+    if table is None:
+        rows = []
+        for blank in range(k * k):
+            row_blank, col_blank = divmod(blank, k)
+            targets = []
+            if(row_blank > 0):
+                targets.append(blank - k)
+            if(row_blank < (k - 1)):
+                targets.append(blank + k)
+            if(col_blank > 0):
+                targets.append(blank - 1)
+            if(col_blank < (k - 1)):
+                targets.append(blank + 1)
+            rows.append(tuple(targets))
+        table = tuple(rows)
+        _neighbor_tables[k] = table
+    return table
+
+
+#Board stored as one flat bytes object (row major, 0 = blank) with the blank index cached.
+#Works for k <= MAX_PACKED_K so every tile fits in a byte, N_Puzzle takes larger boards.
+class PackedPuzzle:
+    def __init__(self, initial_grid : 'list[list[int]] | bytes', parent : 'PackedPuzzle' = None, blank : int = None):
+        if isinstance(initial_grid, (bytes, bytearray)):
+            self.tiles = bytes(initial_grid)
+            self.k = math.isqrt(len(self.tiles))
+        else:
+            #adapter for the list of lists grid used by N_Puzzle
+            self.k = len(initial_grid)
+            if(self.k > MAX_PACKED_K):
+                raise Unsupported(f"PackedPuzzle holds boards up to {MAX_PACKED_K}x{MAX_PACKED_K}, use N_Puzzle")
+            self.tiles = bytes(item for row in initial_grid for item in row)
+        self.blank = self.tiles.index(0) if blank is None else blank
+        self.moves_count = 0
+        self.parent = parent
+        self.priority = 0
+        self.h_value = 0
+
+    #list of lists view, only for code written against N_Puzzle
+    @property
+    def grid(self) -> list[list[int]]:
+        k = self.k
+        return [list(self.tiles[i:i + k]) for i in range(0, k * k, k)]
+
+    def get_blank_index(self):
+        return divmod(self.blank, self.k)
+
+    def swap_blank(self, target : int) -> bytes:
+        buf = bytearray(self.tiles)
+        buf[self.blank] = buf[target]
+        buf[target] = 0
+        return bytes(buf)
+
+    def blank_targets(self) -> tuple[int, ...]:
+        return neighbor_table(self.k)[self.blank]
+
+    def generate_config(self) -> list[bytes]:
+        return [self.swap_blank(target) for target in self.blank_targets()]
+
+    #children are filled in directly : the bytes constructor's checks are for outside boards.
+    #skip : a blank position not to move to (the parent's, the move back only undoes the last one)
+    def generate_children(self, skip : int = -1) -> list['PackedPuzzle']:
+        tiles, blank, k = self.tiles, self.blank, self.k
+        moves_count = self.moves_count + 1
+        children = []
+        for target in neighbor_table(k)[blank]:
+            if target == skip:
+                continue
+            buf = bytearray(tiles)
+            buf[blank] = buf[target]
+            buf[target] = 0
+            child = PackedPuzzle.__new__(PackedPuzzle)
+            child.tiles = bytes(buf)
+            child.k = k
+            child.blank = target
+            child.moves_count = moves_count
+            child.parent = self
+            child.priority = 0
+            child.h_value = 0
+            children.append(child)
+        return children
+
+    def is_correct_config(self) -> bool:
+        return self.tiles == goal_tiles(self.k)
+
+    def is_solvable(self) -> bool:
+        return is_solvable_tiles(self.tiles)
+
+    def __str__(self):
+        k = self.k
+        cells = ["-" if elem == 0 else str(elem) for elem in self.tiles]
+        return ''.join(' '.join(cells[i:i + k]) + ' \n' for i in range(0, k * k, k))
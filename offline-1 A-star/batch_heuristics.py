@@ -0,0 +1,76 @@
+import numpy as np
+
+#NumPy versions of the heuristics.py functions for many boards at once.
+#`states` is an (N, k*k) integer array of flat row major boards (0 = blank);
+#each function returns the N scores and matches its heuristics.py counterpart.
+
+#Stack boards (PackedPuzzle / N_Puzzle / flat tiles) into an (N, k*k) array
+def states_array(states) -> np.ndarray:
+    rows = [state.tiles if hasattr(state, "tiles") else state for state in states]
+    if rows and isinstance(rows[0], (bytes, bytearray)):
+        return np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), -1)
+    return np.asarray(rows, dtype=np.int32)
+
+#goal row / column of every tile value, and the row / column of every cell
+_lookup_tables : dict[int, tuple] = {}
+
+def lookup_tables(k : int) -> tuple:
+    tables = _lookup_tables.get(k)
+    if tables is None:
+        n = k * k
+        tiles = np.arange(n)
+        #the blank gets -1 so it never lands in a row or column
+        goal_row = np.where(tiles == 0, -1, (tiles - 1) // k)
+        goal_col = np.where(tiles == 0, -1, (tiles - 1) % k)
+        cell_row, cell_col = np.divmod(np.arange(n), k)
+        tables = (goal_row, goal_col, cell_row, cell_col)
+        _lookup_tables[k] = tables
+    return tables
+
+def _prepare(states):
+    states = np.asarray(states).astype(np.intp, copy=False)
+    k = int(round(np.sqrt(states.shape[1])))
+    return states, k
+
+def hamming_distance_batch(states) -> np.ndarray:
+    states, k = _prepare(states)
+    goal = np.arange(1, k * k + 1)
+    return np.count_nonzero((states != goal) & (states != 0), axis=1)
+
+def _row_col_offsets(states, k):
+    goal_row, goal_col, cell_row, cell_col = lookup_tables(k)
+    tile = states != 0
+    d_row = np.where(tile, np.abs(cell_row - goal_row[states]), 0)
+    d_col = np.where(tile, np.abs(cell_col - goal_col[states]), 0)
+    return d_row, d_col
+
+def manhattan_distance_batch(states) -> np.ndarray:
+    states, k = _prepare(states)
+    d_row, d_col = _row_col_offsets(states, k)
+    return (d_row + d_col).sum(axis=1)
+
+def euclidean_distance_batch(states) -> np.ndarray:
+    states, k = _prepare(states)
+    d_row, d_col = _row_col_offsets(states, k)
+    return np.sqrt(d_row**2 + d_col**2).sum(axis=1).round(3)
+
+#fewest tiles to take out of each line so the rest are in goal order : the tiles that belong to
+#the line minus the longest run of them in increasing order (tile numbers follow the goal order
+#along a row and down a column), built cell by cell as longest[:, j] = run ending on cell j
+def _line_conflicts(lines, goal_line, line_index):
+    in_line = goal_line[lines] == line_index
+    longest = np.zeros(lines.shape, dtype=np.intp)
+    for j in range(lines.shape[1]):
+        before = in_line[:, :j] & (lines[:, :j] < lines[:, j:j + 1])
+        longest[:, j] = np.where(in_line[:, j], np.where(before, longest[:, :j], 0).max(axis=1, initial=0) + 1, 0)
+    return np.count_nonzero(in_line, axis=1) - longest.max(axis=1)
+
+def linear_conflict_batch(states) -> np.ndarray:
+    states, k = _prepare(states)
+    goal_row, goal_col, _, _ = lookup_tables(k)
+    boards = states.reshape(-1, k, k)
+    conflicts = np.zeros(len(states), dtype=np.intp)
+    for line in range(k):
+        conflicts += _line_conflicts(boards[:, line, :], goal_row, line)
+        conflicts += _line_conflicts(boards[:, :, line], goal_col, line)
+    return manhattan_distance_batch(states) + 2 * conflicts
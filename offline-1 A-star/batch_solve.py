@@ -0,0 +1,119 @@
+from N_Puzzle import N_Puzzle
+from PackedPuzzle import PackedPuzzle, MAX_PACKED_K
+from solvability import validate_board, InvalidBoard, Unsupported
+from heuristics import hamming_distance, manhattan_distance, euclidean_distance, linear_conflict
+from pattern_db import pattern_database
+from walking_distance import walking_distance
+from search import a_star, ida_star, bidirectional_a_star, compact_a_star, weighted_a_star, ara_star, sma_star, SearchLimitReached
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import itertools
+import json
+import sys
+import time
+import traceback
+
+#Batch solver : every instance in the input is "k" followed by the k*k tiles (0 = blank),
+#in the same layout 2105007.py reads, and gives one JSON / CSV line in input order.
+#python batch_solve.py boards.txt --workers 8 --timeout 30 --max-nodes 2000000 --format csv
+
+heuristics_by_name = {
+    "hamming" : hamming_distance,
+    "manhattan" : manhattan_distance,
+    "euclidean" : euclidean_distance,
+    "linear_conflict" : linear_conflict,
+    "pattern_database" : pattern_database,
+    "walking_distance" : walking_distance,
+}
+
+solvers_by_name = {
+    "a_star" : a_star,
+    "ida_star" : ida_star,
+    "bidirectional_a_star" : bidirectional_a_star,
+    "compact_a_star" : compact_a_star,
+    "weighted_a_star" : weighted_a_star,
+    "ara_star" : ara_star,
+    "sma_star" : sma_star,
+}
+
+#solvers that always return a shortest path
+optimal_solvers = {"a_star", "ida_star", "bidirectional_a_star", "compact_a_star", "sma_star"}
+
+FIELDS = ["index", "k", "status", "moves", "expanded", "explored", "time", "peak_frontier"]
+
+#a truncated last record comes out short and is reported as invalid
+def read_instances(stream):
+    tokens = (int(token) for line in stream for token in line.split())
+    for k in tokens:
+        tiles = list(itertools.islice(tokens, k * k))
+        yield k, tiles
+
+#Start state for a checked board : PackedPuzzle, or N_Puzzle once the tiles no longer fit in bytes
+def make_state(k : int, tiles : list[int], Puzzle = PackedPuzzle):
+    validate_board(tiles, k)
+    if Puzzle is PackedPuzzle and k <= MAX_PACKED_K:
+        return PackedPuzzle(bytes(tiles))
+    return N_Puzzle([list(tiles[i:i + k]) for i in range(0, k * k, k)])
+
+#Runs in a worker process, so it only takes and returns plain data
+def solve_instance(task) -> dict:
+    index, k, tiles, heuristic, solver, timeout, max_nodes = task
+    result = dict.fromkeys(FIELDS)
+    result["index"] = index
+    result["k"] = k
+
+    start = time.perf_counter()
+    deadline = start + timeout if timeout is not None else None
+    stats = {}
+    try:
+        path, explored, expanded = solvers_by_name[solver](make_state(k, tiles), heuristics_by_name[heuristic], max_nodes, deadline, stats)
+    except SearchLimitReached as limit:
+        result["status"] = str(limit)
+    except InvalidBoard:
+        #not a permutation of 0 .. k*k-1
+        result["status"] = "invalid"
+    except Unsupported:
+        #a valid board this solver / heuristic pair can not take
+        result["status"] = "unsupported"
+    except Exception:
+        #a bug, not the board : shown on stderr, and the rest of the batch still runs
+        result["status"] = "error"
+        print(f"instance {index} :\n{traceback.format_exc()}", file=sys.stderr, flush=True)
+    else:
+        if path is None:
+            result["status"] = "unsolvable"
+        else:
+            result.update(status="solved", moves=len(path) - 1, expanded=expanded, explored=explored, peak_frontier=stats.get("peak_frontier"))
+    result["time"] = round(time.perf_counter() - start, 6)
+    return result
+
+def solve_batch(instances, heuristic : str = "linear_conflict", solver : str = "a_star", workers : int = None,
+                timeout : float = None, max_nodes : int = None):
+    tasks = ((index, k, tiles, heuristic, solver, timeout, max_nodes) for index, (k, tiles) in enumerate(instances))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(solve_instance, tasks, chunksize=4)
+
+def format_result(result : dict, fmt : str) -> str:
+    if fmt == "json":
+        return json.dumps(result)
+    return ",".join("" if result[field] is None else str(result[field]) for field in FIELDS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve many N-puzzle boards in parallel")
+    parser.add_argument("input", nargs="?", default="-", help="file of boards, - for stdin")
+    parser.add_argument("--heuristic", default="linear_conflict", choices=heuristics_by_name)
+    parser.add_argument("--solver", default="a_star", choices=solvers_by_name)
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--timeout", type=float, default=None, help="seconds allowed per instance")
+    parser.add_argument("--max-nodes", type=int, default=None, help="expansions allowed per instance")
+    parser.add_argument("--format", default="json", choices=["json", "csv"])
+    args = parser.parse_args()
+
+    stream = sys.stdin if args.input == "-" else open(args.input)
+    with stream:
+        if args.format == "csv":
+            print(",".join(FIELDS))
+        results = solve_batch(read_instances(stream), args.heuristic, args.solver, args.workers, args.timeout, args.max_nodes)
+        for result in results:
+            print(format_result(result, args.format), flush=True)
@@ -0,0 +1,258 @@
+from PackedPuzzle import PackedPuzzle, goal_tiles
+from batch_solve import heuristics_by_name, solvers_by_name, optimal_solvers, solve_batch
+from heuristics import manhattan_distance, linear_conflict
+from pattern_db import pattern_database
+from search import sma_star
+from solvability import Unsupported
+import argparse
+import csv
+import os
+import random
+import sys
+
+#Benchmark suite : every instance x heuristic x solver, results to CSV, compared to a baseline.
+#python benchmark.py                       run and compare with benchmarks/baseline.csv
+#python benchmark.py --update-baseline     run and store the results as the new baseline
+#python benchmark.py --korf                also run the Korf 100 set (benchmarks/korf100.txt), off by
+#                                          default : most instances need far more than --max-nodes
+#python benchmark.py --check-optimal       heuristic consistency and optimal solvers on 3x3, then exit
+
+BENCH_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks")
+INSTANCES_PATH = os.path.join(BENCH_DIR, "instances.txt")
+KORF_PATH = os.path.join(BENCH_DIR, "korf100.txt")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.csv")
+
+FIELDS = ["instance", "k", "depth", "heuristic", "solver", "status", "moves", "expanded", "explored",
+          "time", "nodes_per_sec", "peak_frontier"]
+
+#(k, depths, boards per depth) of the generated set
+GENERATED_SET = [(3, [8, 14, 20, 26], 2), (4, [20, 30, 40], 2), (5, [20, 30], 2)]
+
+#node budgets sma_star is checked with : small enough that it has to forget and regenerate
+SMA_CHECK_BUDGETS = [60, 200, 1000]
+
+#heuristics the optimal solvers are checked with : A* never reopens a board, so each must be consistent
+CHECK_HEURISTICS = [manhattan_distance, linear_conflict, pattern_database]
+
+
+#Exact distance of every 3x3 board from the goal by breadth first search
+def distances_3x3() -> dict[bytes, int]:
+    goal = goal_tiles(3)
+    dist = {goal : 0}
+    frontier = [goal]
+    depth = 0
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for board in frontier:
+            for config in PackedPuzzle(board).generate_config():
+                if config not in dist:
+                    dist[config] = depth
+                    next_frontier.append(config)
+        frontier = next_frontier
+    return dist
+
+#Random walk of `depth` moves from the goal that never revisits a board : at most depth
+#moves from the goal, usually close to it
+def scramble(k : int, depth : int, rng : random.Random) -> bytes:
+    state = PackedPuzzle(goal_tiles(k))
+    visited = {state.tiles}
+    while state.moves_count < depth:
+        children = [child for child in state.generate_children() if child.tiles not in visited]
+        if not children:
+            state = PackedPuzzle(goal_tiles(k))
+            visited = {state.tiles}
+            continue
+        state = rng.choice(children)
+        visited.add(state.tiles)
+    return state.tiles
+
+#(name, k, depth, tiles) with exact depths on 3x3 and scramble lengths on larger boards
+def generate_instances(seed : int = 318) -> list[tuple]:
+    rng = random.Random(seed)
+    instances = []
+    for k, depths, count in GENERATED_SET:
+        by_depth = {}
+        if k == 3:
+            for board, dist in sorted(distances_3x3().items()):
+                by_depth.setdefault(dist, []).append(board)
+        for depth in depths:
+            for i in range(count):
+                tiles = rng.choice(by_depth[depth]) if k == 3 else scramble(k, depth, rng)
+                instances.append((f"k{k}_d{depth}_{i}", k, depth, list(tiles)))
+    return instances
+
+def write_instances(path : str, instances : list[tuple]):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        for name, k, depth, tiles in instances:
+            f.write(f"{name} {k} {depth} " + " ".join(map(str, tiles)) + "\n")
+
+def read_instances(path : str) -> list[tuple]:
+    instances = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            name, k, depth, *tiles = line.split()
+            instances.append((name, int(k), int(depth), list(map(int, tiles))))
+    return instances
+
+#Korf's 15-puzzle set, one "number optimal_moves t0 ... t15" line per instance with his goal
+#(blank first, tile t at cell t). Turning the board half way round gives this repo's goal : the
+#tile on cell p moves to cell 15 - p and tile t becomes 16 - t, with every distance unchanged.
+def read_korf(path : str) -> list[tuple]:
+    instances = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip() or line.startswith("#"):
+                continue
+            number, depth, *tiles = map(int, line.split())
+            rotated = [16 - tile if tile else 0 for tile in reversed(tiles)]
+            instances.append((f"korf_{number}", 4, depth, rotated))
+    return instances
+
+#First 3x3 move, if any, across which h_n changes by more than 1 (the move's cost) : A* can then
+#close a board before its shortest path is known
+def find_inconsistent(h_n, dist : dict[bytes, int]) -> str:
+    h = {board : h_n(board) for board in dist}
+    for board in sorted(dist):
+        for config in PackedPuzzle(board).generate_config():
+            if abs(h[config] - h[board]) > 1:
+                return f"{' '.join(map(str, board))} -> {' '.join(map(str, config))} : h {h[board]} -> {h[config]}"
+    return None
+
+#CHECK_HEURISTICS for consistency over every 3x3 move, then every optimal solver with each of them
+#(and sma_star at small node budgets) on random 3x3 boards against the exact distances : list of
+#"solver/heuristic board : moves (exact d)" for every path of the wrong length. Unsupported pairs
+#are skipped.
+def check_optimal(count : int = 150, seed : int = 318) -> list[str]:
+    dist = distances_3x3()
+    mismatches = []
+    for h_n in CHECK_HEURISTICS:
+        edge = find_inconsistent(h_n, dist)
+        if edge is not None:
+            mismatches.append(f"{h_n.__name__} inconsistent {edge}")
+    boards = random.Random(seed).sample(sorted(dist), count)
+    runs = [(f"{name}/{h_n.__name__}", lambda state, solver=solvers_by_name[name], h_n=h_n : solver(state, h_n))
+            for name in sorted(optimal_solvers) for h_n in CHECK_HEURISTICS]
+    runs += [(f"sma_star/{budget}", lambda state, budget=budget : sma_star(state, manhattan_distance, node_budget=budget))
+             for budget in SMA_CHECK_BUDGETS]
+    for name, run in runs:
+        for board in boards:
+            try:
+                moves = len(run(PackedPuzzle(board))[0]) - 1
+            except Unsupported:
+                break
+            if moves != dist[board]:
+                mismatches.append(f"{name} {' '.join(map(str, board))} : {moves} (exact {dist[board]})")
+    return mismatches
+
+
+def run_suite(instances, heuristics, solvers, max_nodes, timeout, workers) -> list[dict]:
+    boards = [(k, tiles) for _, k, _, tiles in instances]
+    rows = []
+    #one pool pass per (heuristic, solver) pair over every board
+    for heuristic in heuristics:
+        for solver in solvers:
+            results = solve_batch(boards, heuristic, solver, workers, timeout, max_nodes)
+            for (name, k, depth, _), result in zip(instances, results):
+                expanded = result["expanded"]
+                elapsed = result["time"]
+                rows.append({
+                    "instance" : name, "k" : k, "depth" : depth, "heuristic" : heuristic, "solver" : solver,
+                    "status" : result["status"], "moves" : result["moves"], "expanded" : expanded,
+                    "explored" : result["explored"], "time" : elapsed,
+                    "nodes_per_sec" : round(expanded / elapsed, 1) if expanded and elapsed else None,
+                    "peak_frontier" : result["peak_frontier"],
+                })
+                print(f"{name:>14} {heuristic:>16} {solver:>20} {result['status']:>10} {expanded or '':>9} {elapsed:>9.3f}s",
+                      file=sys.stderr, flush=True)
+    return rows
+
+def write_csv(path : str, rows : list[dict]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+
+def read_csv(path : str) -> list[dict]:
+    with open(path, newline="") as f:
+        return list(csv.DictReader(f))
+
+#list of regressions against the baseline : lost solutions, changed optimal lengths,
+#expansions above tolerance and, if time_tolerance is given, nodes/sec drops beyond it
+def compare(rows : list[dict], baseline : list[dict], tolerance : float, time_tolerance : float = None) -> list[str]:
+    expected = {(row["instance"], row["heuristic"], row["solver"]) : row for row in baseline}
+    regressions = []
+    for row in rows:
+        key = (row["instance"], row["heuristic"], row["solver"])
+        base = expected.get(key)
+        if base is None:
+            continue
+        label = "/".join(key)
+        if base["status"] == "solved" and row["status"] != "solved":
+            regressions.append(f"{label} : {row['status']} (baseline solved)")
+            continue
+        if row["status"] != "solved" or base["status"] != "solved":
+            continue
+        if row["solver"] in optimal_solvers and int(row["moves"]) != int(base["moves"]):
+            regressions.append(f"{label} : {row['moves']} moves (baseline {base['moves']})")
+        if int(row["expanded"]) > int(base["expanded"]) * (1 + tolerance):
+            regressions.append(f"{label} : {row['expanded']} expanded (baseline {base['expanded']})")
+        if time_tolerance is not None and base["nodes_per_sec"] and row["nodes_per_sec"]:
+            if float(row["nodes_per_sec"]) < float(base["nodes_per_sec"]) * (1 - time_tolerance):
+                regressions.append(f"{label} : {row['nodes_per_sec']} nodes/s (baseline {base['nodes_per_sec']})")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="N-puzzle benchmark with baseline regression check")
+    parser.add_argument("--heuristics", default=",".join(heuristics_by_name), help="comma separated")
+    parser.add_argument("--solvers", default=",".join(solvers_by_name), help="comma separated")
+    parser.add_argument("--sizes", default="3,4,5", help="board sizes of the generated set")
+    parser.add_argument("--korf", action="store_true", help="add the Korf 100 set in benchmarks/korf100.txt")
+    parser.add_argument("--max-nodes", type=int, default=100000, help="expansions allowed per run")
+    parser.add_argument("--timeout", type=float, default=60, help="seconds allowed per run")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--output", default="benchmark_results.csv")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.05, help="allowed relative growth of expansions")
+    parser.add_argument("--time-tolerance", type=float, default=None, help="allowed relative drop of nodes/sec")
+    parser.add_argument("--regenerate", action="store_true", help="rewrite benchmarks/instances.txt")
+    parser.add_argument("--check-optimal", action="store_true", help="check optimal solvers on 3x3 and exit")
+    args = parser.parse_args()
+
+    if args.check_optimal:
+        mismatches = check_optimal()
+        for mismatch in mismatches:
+            print("  " + mismatch)
+        print(f"{len(mismatches)} problems")
+        sys.exit(1 if mismatches else 0)
+
+    if args.regenerate or not os.path.exists(INSTANCES_PATH):
+        write_instances(INSTANCES_PATH, generate_instances())
+    sizes = {int(size) for size in args.sizes.split(",")}
+    instances = [instance for instance in read_instances(INSTANCES_PATH) if instance[1] in sizes]
+    if args.korf:
+        instances += read_korf(KORF_PATH)
+
+    rows = run_suite(instances, args.heuristics.split(","), args.solvers.split(","), args.max_nodes, args.timeout, args.workers)
+    write_csv(args.output, rows)
+    print(f"{len(rows)} runs written to {args.output}")
+
+    if args.update_baseline:
+        write_csv(args.baseline, rows)
+        print(f"baseline updated : {args.baseline}")
+    elif os.path.exists(args.baseline):
+        regressions = compare(rows, read_csv(args.baseline), args.tolerance, args.time_tolerance)
+        if regressions:
+            print(f"REGRESSIONS ({len(regressions)}) against {args.baseline}:")
+            for regression in regressions:
+                print("  " + regression)
+            sys.exit(1)
+        print(f"no regressions against {args.baseline}")
+    else:
+        print(f"no baseline at {args.baseline}, run with --update-baseline to create it")
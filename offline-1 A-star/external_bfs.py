@@ -0,0 +1,126 @@
+from PackedPuzzle import PackedPuzzle, goal_tiles
+import argparse
+import heapq
+import os
+import tempfile
+
+#External memory breadth first search from the goal. Every layer is a file of sorted, distinct
+#fixed width records (one flat board of k*k bytes each), so memory stays at chunk_size boards
+#however big the layers get. Layer d holds exactly the boards d moves from the goal.
+#With a pattern, tiles outside it are written as WILDCARD, which gives the distance table of
+#that abstraction (a non additive pattern database where every move counts).
+#python external_bfs.py 4 --pattern 1,2,3,4,5 --work-dir layers --keep-layers
+
+WILDCARD = 255
+READ_RECORDS = 65536
+
+def read_records(path : str, size : int):
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(size * READ_RECORDS)
+            if not block:
+                return
+            for i in range(0, len(block), size):
+                yield block[i:i + size]
+
+#sorted, de-duplicated run of boards
+def write_run(path : str, records) -> int:
+    count = 0
+    with open(path, "wb") as f:
+        previous = None
+        for record in records:
+            if record != previous:
+                f.write(record)
+                count += 1
+                previous = record
+    return count
+
+#records of the sorted stream `records` that are not in the sorted stream `exclude`
+def subtract_sorted(records, exclude):
+    excluded = next(exclude, None)
+    for record in records:
+        while excluded is not None and excluded < record:
+            excluded = next(exclude, None)
+        if record != excluded:
+            yield record
+
+def layer_path(work_dir : str, depth : int) -> str:
+    return os.path.join(work_dir, f"layer_{depth:03d}.bin")
+
+def start_board(k : int, pattern : list[int] = None) -> bytes:
+    goal = goal_tiles(k)
+    if pattern is None:
+        return goal
+    keep = set(pattern) | {0}
+    return bytes(tile if tile in keep else WILDCARD for tile in goal)
+
+def successors(board : bytes):
+    return PackedPuzzle(board).generate_config()
+
+#returns the number of boards per layer
+def external_bfs(k : int, pattern : list[int] = None, work_dir : str = None, chunk_size : int = 1000000,
+                 keep_layers : bool = False, verbose : bool = True) -> list[int]:
+    start = start_board(k, pattern)
+    if pattern is None and not(PackedPuzzle(start).is_solvable()):
+        raise ValueError("start board is not solvable")
+    size = len(start)
+    own_dir = work_dir is None
+    work_dir = work_dir or tempfile.mkdtemp(prefix="puzzle_bfs_")
+    os.makedirs(work_dir, exist_ok=True)
+    run_dir = os.path.join(work_dir, "runs")
+    os.makedirs(run_dir, exist_ok=True)
+
+    write_run(layer_path(work_dir, 0), [start])
+    counts = [1]
+    depth = 0
+    while counts[-1]:
+        #expand the layer into sorted runs of at most chunk_size boards
+        runs = []
+        chunk = []
+        for board in read_records(layer_path(work_dir, depth), size):
+            chunk.extend(successors(board))
+            if len(chunk) >= chunk_size:
+                runs.append(os.path.join(run_dir, f"run_{len(runs):05d}.bin"))
+                chunk.sort()
+                write_run(runs[-1], chunk)
+                chunk = []
+        if chunk:
+            runs.append(os.path.join(run_dir, f"run_{len(runs):05d}.bin"))
+            chunk.sort()
+            write_run(runs[-1], chunk)
+
+        #merge the runs; a move always changes the blank's colour on a checkerboard, so
+        #the only boards already seen among the successors are in the previous layer
+        merged = heapq.merge(*(read_records(run, size) for run in runs))
+        if depth > 0:
+            merged = subtract_sorted(merged, read_records(layer_path(work_dir, depth - 1), size))
+        counts.append(write_run(layer_path(work_dir, depth + 1), merged))
+        for run in runs:
+            os.remove(run)
+        if not keep_layers and depth > 0:
+            os.remove(layer_path(work_dir, depth - 1))
+        depth += 1
+        if verbose and counts[-1]:
+            print(f"depth {depth} : {counts[-1]} boards", flush=True)
+
+    os.remove(layer_path(work_dir, depth))  # the empty last layer
+    os.rmdir(run_dir)
+    if not keep_layers:
+        os.remove(layer_path(work_dir, depth - 1))
+        if own_dir:
+            os.rmdir(work_dir)
+    return counts[:-1]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Layer by layer BFS from the goal with the layers on disk")
+    parser.add_argument("k", type=int)
+    parser.add_argument("--pattern", default=None, help="comma separated tiles to keep, e.g. 1,2,3,4,5")
+    parser.add_argument("--work-dir", default=None)
+    parser.add_argument("--chunk-size", type=int, default=1000000, help="boards sorted in memory at once")
+    parser.add_argument("--keep-layers", action="store_true", help="keep every layer file as the distance table")
+    args = parser.parse_args()
+
+    pattern = [int(tile) for tile in args.pattern.split(",")] if args.pattern else None
+    counts = external_bfs(args.k, pattern, args.work_dir, args.chunk_size, args.keep_layers)
+    print(f"{sum(counts)} boards, deepest at {len(counts) - 1} moves")
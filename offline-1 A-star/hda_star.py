@@ -0,0 +1,227 @@
+from PackedPuzzle import goal_tiles, neighbor_table
+from heuristics import incremental_heuristics
+from PQueue import PriorityQueue
+from search import SearchLimitReached, replay_moves, require_packed
+import multiprocessing as mp
+import os
+import queue
+import time
+import zlib
+
+#Hash distributed A* (HDA*) : worker i owns the boards with crc32(board) % workers == i and keeps
+#their open list and best g. A generated board is sent to its owner in batches, the owner drops
+#it unless it beats the best g seen for that board. Every node carries the blank positions of
+#its path, so a solution needs no parent pointers spread over the processes. Boards a worker
+#owns itself go straight into its open list.
+#Optimal termination : a goal popped with g < incumbent becomes the incumbent, nodes with
+#f >= incumbent are pruned, and the search stops once every worker has nothing below the
+#incumbent and every sent batch has been received (checked twice with equal counters).
+
+BATCH_SIZE = 64      # boards per message
+EXPAND_SLICE = 256   # expansions between inbox checks
+
+def owner(tiles : bytes, workers : int) -> int:
+    return zlib.crc32(tiles) % workers
+
+def hda_worker(index, workers, k, h_n, inboxes, results, sent, received, idle, incumbent,
+               expanded_total, abort, done, max_nodes, deadline):
+    goal = goal_tiles(k)
+    neighbors = neighbor_table(k)
+    h_update = incremental_heuristics.get(h_n)
+    inbox = inboxes[index]
+    outboxes = [[] for _ in range(workers)]
+    pqueue = PriorityQueue()
+    best_g : dict[bytes, int] = {}
+    explored = 0
+    expanded = 0
+    peak_frontier = 0
+
+    def flush(dest):
+        with sent.get_lock():
+            sent[index] += 1
+        inboxes[dest].put(outboxes[dest])
+        outboxes[dest] = []
+
+    #priority f, ties go to the deeper node (lower h)
+    def add(node):
+        nonlocal explored
+        tiles, blank, g, h, moves = node
+        if g + h >= incumbent.value or best_g.get(tiles, g + 1) <= g:
+            return
+        best_g[tiles] = g
+        pqueue.push((g + h, h), node)
+        explored += 1
+
+    def receive(batch):
+        for node in batch:
+            add(node)
+        with received.get_lock():
+            received[index] += 1
+
+    try:
+        while not(done.is_set()):
+            #take every waiting batch, blocking briefly only when there is no work
+            has_work = pqueue.size() != 0 and pqueue.heap[0][0][0] < incumbent.value
+            while True:
+                try:
+                    batch = inbox.get(timeout=0.005) if not(has_work) else inbox.get_nowait()
+                except queue.Empty:
+                    break
+                idle[index] = 0
+                receive(batch)
+                has_work = True
+            if not(pqueue.size() != 0 and pqueue.heap[0][0][0] < incumbent.value):
+                for dest in range(workers):
+                    if outboxes[dest]:
+                        flush(dest)
+                idle[index] = 1
+                continue
+            idle[index] = 0
+
+            for _ in range(EXPAND_SLICE):
+                if pqueue.size() == 0:
+                    break
+                (f, _), (tiles, blank, g, h, moves) = pqueue.pop()
+                if f >= incumbent.value:
+                    break
+                if best_g[tiles] < g:
+                    continue
+                expanded += 1
+                if tiles == goal:
+                    with incumbent.get_lock():
+                        if g < incumbent.value:
+                            incumbent.value = g
+                            results.put(("solution", g, moves))
+                    continue
+                if not(expanded & 1023):
+                    with expanded_total.get_lock():
+                        expanded_total.value += 1024
+                        if max_nodes is not None and expanded_total.value > max_nodes:
+                            raise SearchLimitReached("node_limit")
+                    if deadline is not None and time.perf_counter() > deadline:
+                        raise SearchLimitReached("timeout")
+
+                #moving the blank straight back only undoes the previous move (the root's children
+                #are dropped by their owner instead)
+                prev_blank = moves[-2] if len(moves) > 1 else -1
+                for target in neighbors[blank]:
+                    if target == prev_blank:
+                        continue
+                    buf = bytearray(tiles)
+                    tile = buf[target]
+                    buf[blank] = tile
+                    buf[target] = 0
+                    nei_tiles = bytes(buf)
+                    nei_h = h_n(nei_tiles) if h_update is None else h_update(h, nei_tiles, tile, target, blank, k)
+                    if g + 1 + nei_h >= incumbent.value:
+                        continue
+                    node = (nei_tiles, target, g + 1, nei_h, moves + bytes((target,)))
+                    dest = owner(nei_tiles, workers)
+                    if dest == index:
+                        add(node)
+                        continue
+                    outboxes[dest].append(node)
+                    if len(outboxes[dest]) >= BATCH_SIZE:
+                        flush(dest)
+            peak_frontier = max(peak_frontier, pqueue.size())
+            for dest in range(workers):
+                if outboxes[dest]:
+                    flush(dest)
+    except SearchLimitReached as limit:
+        abort.put(str(limit))
+    finally:
+        #nobody reads the inboxes after done, so do not wait at exit for batches to be flushed
+        for box in inboxes:
+            box.cancel_join_thread()
+        results.put(("stats", index, explored, expanded, peak_frontier))
+
+
+def hda_star(initial_state, h_n, max_nodes : int = None, deadline : float = None, stats : dict = None,
+             workers : int = None):
+    if not(initial_state.is_solvable()):
+        return None, 0, 0
+    require_packed(initial_state)
+
+    workers = workers or os.cpu_count()
+    k = initial_state.k
+    start = bytes(initial_state.tiles)
+    #fork keeps h_n and any heuristic tables already loaded in this process
+    ctx = mp.get_context("fork") if "fork" in mp.get_all_start_methods() else mp.get_context()
+    inboxes = [ctx.Queue() for _ in range(workers)]
+    results = ctx.Queue()
+    abort = ctx.Queue()
+    sent = ctx.Array('q', workers + 1)       # batches sent per worker, the last slot for this process
+    received = ctx.Array('q', workers)
+    idle = ctx.Array('b', workers, lock=False)
+    incumbent = ctx.Value('d', float('inf'))
+    expanded_total = ctx.Value('q', 0)
+    done = ctx.Event()
+
+    #scored before any worker starts, so a heuristic that rejects the board leaves nothing running
+    root_h = h_n(start)
+    processes = [ctx.Process(target=hda_worker, args=(i, workers, k, h_n, inboxes, results, sent, received, idle,
+                                                      incumbent, expanded_total, abort, done, max_nodes, deadline))
+                 for i in range(workers)]
+
+    best = None
+    limit = None
+    previous_wave = None
+    try:
+        for process in processes:
+            process.start()
+        sent[workers] = 1
+        inboxes[owner(start, workers)].put([(start, start.index(0), 0, root_h, b"")])
+        while True:
+            time.sleep(0.002)
+            try:
+                limit = abort.get_nowait()
+                break
+            except queue.Empty:
+                pass
+            #workers only return after done is set : an exit now is a crash, unless it hit a limit
+            crashed = [process for process in processes if process.exitcode is not None]
+            if crashed:
+                try:
+                    limit = abort.get(timeout=0.1)
+                    break
+                except queue.Empty:
+                    raise RuntimeError(f"hda_star worker {crashed[0].name} exited with code {crashed[0].exitcode}")
+            #two waves in a row with every worker idle, the same counters and nothing in flight
+            wave = (all(idle), sum(sent[:]), sum(received[:]))
+            if wave[0] and wave[1] == wave[2] and wave == previous_wave:
+                break
+            previous_wave = wave
+    except BaseException:
+        #the other workers may be blocked or waiting on work that will never come
+        for process in processes:
+            if process.pid is not None:
+                process.terminate()
+                process.join()
+        raise
+    finally:
+        done.set()
+
+    explored = expanded = peak_frontier = 0
+    finished = 0
+    while finished < workers:
+        message = results.get()
+        if message[0] == "solution":
+            if best is None or message[1] < best[0]:
+                best = (message[1], message[2])
+        else:
+            _, _, worker_explored, worker_expanded, worker_peak = message
+            explored += worker_explored
+            expanded += worker_expanded
+            peak_frontier += worker_peak
+            finished += 1
+    for inbox in inboxes:
+        inbox.cancel_join_thread()
+    for process in processes:
+        process.join()
+
+    if limit is not None:
+        raise SearchLimitReached(limit)
+    if stats is not None:
+        stats["peak_frontier"] = peak_frontier
+        stats["workers"] = workers
+    return replay_moves(initial_state, list(best[1])), explored, expanded
@@ -0,0 +1,143 @@
+from PackedPuzzle import PackedPuzzle
+from batch_solve import heuristics_by_name
+from benchmark import distances_3x3, scramble
+from instrumented_search import effective_branching_factor
+from pattern_db import pattern_database
+from search import a_star, ida_star, SearchLimitReached
+import argparse
+import csv
+import random
+import sys
+import time
+
+#Heuristic profiler : random solvable boards at known optimal depths, and per heuristic and depth
+#the mean value, its ratio to the true distance, evaluations per second, and what A* does with it
+#(expansions, effective branching factor, time to solution).
+#Depths are exact : from a full BFS on 3x3, from IDA* with the pattern database on larger boards
+#(IDA* returns a shortest path with any admissible heuristic, consistent or not).
+#python heuristic_profile.py --k 4 --depths 10,20,30 --boards 10 --format markdown
+
+FIELDS = ["heuristic", "k", "depth", "boards", "mean_h", "h_ratio", "evals_per_sec", "solved",
+          "mean_expanded", "branching_factor", "mean_time"]
+
+#{depth : boards}, `per_depth` boards at each requested depth, fewer (with a warning) where
+#there are not that many or the random walks did not find them
+def sample_boards(k : int, depths : list[int], per_depth : int, seed : int = 7) -> dict[int, list[bytes]]:
+    rng = random.Random(seed)
+    samples = {depth : [] for depth in depths}
+    if k == 3:
+        by_depth = {}
+        for board, dist in sorted(distances_3x3().items()):
+            by_depth.setdefault(dist, []).append(board)
+        for depth in depths:
+            pool = by_depth.get(depth, [])
+            samples[depth] = rng.sample(pool, min(per_depth, len(pool)))
+    else:
+        #random walks are shorter than they look, so solve each one and keep it if its true
+        #distance is a depth still missing boards
+        attempts = 0
+        while any(len(boards) < per_depth for boards in samples.values()) and attempts < 200 * per_depth * len(depths):
+            attempts += 1
+            missing = [depth for depth, boards in samples.items() if len(boards) < per_depth]
+            target = rng.choice(missing)
+            board = scramble(k, rng.randint(target, 2 * target), rng)
+            depth = len(ida_star(PackedPuzzle(board), pattern_database)[0]) - 1
+            if depth in samples and len(samples[depth]) < per_depth and board not in samples[depth]:
+                samples[depth].append(board)
+
+    for depth, boards in samples.items():
+        if len(boards) < per_depth:
+            print(f"warning : depth {depth} has {len(boards)} of {per_depth} boards", file=sys.stderr, flush=True)
+    return samples
+
+#evaluations per second over the boards, repeated for at least min_time seconds
+def eval_rate(h_n, boards : list[bytes], min_time : float = 0.2) -> float:
+    evals = 0
+    start = time.perf_counter()
+    while True:
+        for board in boards:
+            h_n(board)
+        evals += len(boards)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return evals / elapsed
+
+#(board, depth, h value, A* expansions, A* seconds), expansions and seconds None past max_nodes
+def measure(h_n, boards : list[tuple[bytes, int]], max_nodes : int) -> list[tuple]:
+    results = []
+    for board, depth in boards:
+        start = time.perf_counter()
+        try:
+            _, _, expanded = a_star(PackedPuzzle(board), h_n, max_nodes)
+        except SearchLimitReached:
+            results.append((board, depth, h_n(board), None, None))
+            continue
+        results.append((board, depth, h_n(board), expanded, time.perf_counter() - start))
+    return results
+
+def summarize(name : str, h_n, k : int, depth, results : list[tuple]) -> dict:
+    mean = lambda items : sum(items) / len(items) if items else None
+    ratios = [value / dist for _, dist, value, _, _ in results if dist]
+    solved = [result for result in results if result[3] is not None]
+    return {
+        "heuristic" : name,
+        "k" : k,
+        "depth" : depth,
+        "boards" : len(results),
+        "mean_h" : round(mean([value for _, _, value, _, _ in results]), 3),
+        "h_ratio" : round(mean(ratios), 4) if ratios else None,
+        "evals_per_sec" : round(eval_rate(h_n, [board for board, _, _, _, _ in results])),
+        "solved" : len(solved),
+        "mean_expanded" : round(mean([expanded for _, _, _, expanded, _ in solved]), 1) if solved else None,
+        "branching_factor" : round(mean([effective_branching_factor(expanded, dist) for _, dist, _, expanded, _ in solved]), 4) if solved else None,
+        "mean_time" : round(mean([seconds for _, _, _, _, seconds in solved]), 6) if solved else None,
+    }
+
+def profile(k : int, depths : list[int], per_depth : int, heuristics : list[str], max_nodes : int = 200000,
+            seed : int = 7) -> list[dict]:
+    samples = sample_boards(k, depths, per_depth, seed)
+    rows = []
+    for name in heuristics:
+        h_n = heuristics_by_name[name]
+        everything = []
+        for depth in depths:
+            if not samples[depth]:
+                continue
+            results = measure(h_n, [(board, depth) for board in samples[depth]], max_nodes)
+            everything += results
+            rows.append(summarize(name, h_n, k, depth, results))
+            print(f"{name} depth {depth} done", file=sys.stderr, flush=True)
+        if everything:
+            rows.append(summarize(name, h_n, k, "all", everything))
+    return rows
+
+def write_markdown(rows : list[dict], out):
+    out.write("| " + " | ".join(FIELDS) + " |\n")
+    out.write("|" + "---|" * len(FIELDS) + "\n")
+    for row in rows:
+        out.write("| " + " | ".join("" if row[field] is None else str(row[field]) for field in FIELDS) + " |\n")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare heuristics on boards of known optimal depth")
+    parser.add_argument("--k", type=int, default=3)
+    parser.add_argument("--depths", default="8,12,16,20,24", help="comma separated optimal depths")
+    parser.add_argument("--boards", type=int, default=20, help="boards per depth")
+    parser.add_argument("--heuristics", default="hamming,manhattan,euclidean,linear_conflict", help="comma separated")
+    parser.add_argument("--max-nodes", type=int, default=200000, help="A* expansions allowed per board")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--format", default="markdown", choices=["markdown", "csv"])
+    parser.add_argument("--output", default="-", help="file to write, - for stdout")
+    args = parser.parse_args()
+
+    rows = profile(args.k, [int(depth) for depth in args.depths.split(",")], args.boards,
+                   args.heuristics.split(","), args.max_nodes, args.seed)
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    if args.format == "csv":
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        write_markdown(rows, out)
+    if out is not sys.stdout:
+        out.close()
@@ -1,85 +1,200 @@
+from solvability import flatten
+import bisect
 import math
 
+#Every heuristic takes either a k x k grid (list of lists) or the flat row major
+#tiles of a board (PackedPuzzle.tiles / N_Puzzle.tiles), read through flatten
+
 #Hamming Distance
 def hamming_distance(grid : list[list[int]]) -> int:
-    flattened_grid = [item for arr in grid for item in arr]
+    flattened_grid, _ = flatten(grid)
     dist = 0
     for i, num in enumerate(flattened_grid):
         if(num != 0 and i + 1 != num):
             dist += 1
-    
+
     return dist
 
 #Manhattan Distance
 def manhattan_distance(grid : list[list[int]]) -> int:
     dist = 0
-    k = len(grid)
-    for row, arr in enumerate(grid):
-        for col, num in enumerate(arr):
-            if(num == 0):
-                continue
-            target_row = (num - 1) // k
-            target_col = (num - 1) % k
-            curr_dist = abs(row - target_row) + abs(col - target_col)
-            dist += curr_dist
-            #print(f"manhattan dist for {num} = {curr_dist}")
-        
+    tiles, k = flatten(grid)
+    for i, num in enumerate(tiles):
+        if(num == 0):
+            continue
+        row, col = divmod(i, k)
+        target_row = (num - 1) // k
+        target_col = (num - 1) % k
+        curr_dist = abs(row - target_row) + abs(col - target_col)
+        dist += curr_dist
+        #print(f"manhattan dist for {num} = {curr_dist}")
+
     return dist
 
 #Euclidean Distance
 def euclidean_distance(grid : list[list[int]]) -> int:
     dist = 0
-    k = len(grid)
-    for row, arr in enumerate(grid):
-        for col, num in enumerate(arr):
-            if(num == 0):
-                continue
-            target_row = (num - 1) // k
-            target_col = (num - 1) % k
-            curr_dist = (abs(row - target_row))**2 + (abs(col - target_col))**2
-            dist += math.sqrt(curr_dist)
-            #print(f"euclidean dist squared for {num} = {curr_dist}")
+    tiles, k = flatten(grid)
+    for i, num in enumerate(tiles):
+        if(num == 0):
+            continue
+        row, col = divmod(i, k)
+        target_row = (num - 1) // k
+        target_col = (num - 1) % k
+        curr_dist = (abs(row - target_row))**2 + (abs(col - target_col))**2
+        dist += math.sqrt(curr_dist)
+        #print(f"euclidean dist squared for {num} = {curr_dist}")
 
     return dist.__round__(3)
 
-def row_conflicts(arr, row, num, num_index):
-    conflicts = 0
-    k = len(arr)
-    for i,elem in enumerate(arr):
-        target_row = (elem - 1) // k
-        if(row == target_row and num > elem and num_index < i):
-            conflicts += 1
-            #print(f"conflict in row {row} bw {num} and {elem}")
-    
-    return conflicts
-
-def col_conflicts(arr, col, num, num_index):
-    conflicts = 0
-    k = len(arr)
-    for i, elem in enumerate(arr):
-        target_col = (elem - 1) % k
-        if(col == target_col and num > elem and num_index < i):
-            conflicts += 1
-            #print(f"conflict in col {col} bw {num} and {elem}")
-
-    return conflicts
-
-#Linear Conflict
+#Linear conflict tables : a row (or column) is coded by one base k+1 digit per cell, the goal
+#column (goal row) of its tile when the tile belongs in that line, k otherwise (blank included).
+#The table gives the conflicts of a code : the fewest tiles to take out of the line so that the
+#rest are in goal order. Each of them has to leave the line and come back, 2 moves on top of the
+#Manhattan distance. Rows and columns share one table per board size.
+def code_conflicts(code, k):
+    #longest run of the line's tiles already in goal order, by patience sorting
+    in_line = 0
+    tails = []
+    for _ in range(k):
+        code, digit = divmod(code, k + 1)
+        if(digit != k):
+            in_line += 1
+            i = bisect.bisect_left(tails, digit)
+            if(i == len(tails)):
+                tails.append(digit)
+            else:
+                tails[i] = digit
+    return in_line - len(tails)
+
+#filled up front up to 6x6 ((k+1)**k codes), on first sight of a line beyond
+class ConflictTable(dict):
+    def __init__(self, k):
+        super().__init__()
+        self.k = k
+        n = k * k
+        #tiles 0 .. n : the backward search of bidirectional_a_star relabels a tile as n
+        self.stride = n + 1
+        #row_digit[row * stride + tile] : digit of tile in the code of that row, col_digit the same
+        #for columns, and weight[i] the place value of the i-th cell of a line
+        self.row_digit = [k] * (k * self.stride)
+        self.col_digit = [k] * (k * self.stride)
+        for tile in range(1, self.stride):
+            goal_row, goal_col = divmod(tile - 1, k)
+            self.row_digit[goal_row * self.stride + tile] = goal_col
+            self.col_digit[goal_col * self.stride + tile] = goal_row
+        self.weight = [(k + 1) ** i for i in range(k)]
+        if(k <= 6):
+            for code in range((k + 1) ** k):
+                self[code] = code_conflicts(code, k)
+
+    def __missing__(self, code):
+        value = code_conflicts(code, self.k)
+        self[code] = value
+        return value
+
+_conflict_tables : dict[int, ConflictTable] = {}
+
+def conflict_table(k) -> ConflictTable:
+    table = _conflict_tables.get(k)
+    if table is None:
+        table = ConflictTable(k)
+        _conflict_tables[k] = table
+    return table
+
+#Linear Conflict : 2k table lookups on top of the Manhattan distance
 def linear_conflict(grid : list[list[int]]) -> int:
-    conflicts = 0
-    k = len(grid)
-    #row wise
-    for row, arr in enumerate(grid):
-        for col, num in enumerate(arr):
-            target_row = (num - 1) // k
-            target_col = (num - 1) % k
-            if(target_row == row):
-                conflicts += row_conflicts(arr, row, num, col)
-            if(target_col == col):
-                col_arr = [row[col] for row in grid]
-                conflicts += col_conflicts(col_arr, col, num, row)
-    
-    #print(f"no of linear conflicts : {conflicts}")
-    return manhattan_distance(grid) + (2 * conflicts)
-            
-            
+    tiles, k = flatten(grid)
+    table = conflict_table(k)
+    row_digit, col_digit, weight, stride = table.row_digit, table.col_digit, table.weight, table.stride
+    row_codes = [0] * k
+    col_codes = [0] * k
+    for pos, tile in enumerate(tiles):
+        row, col = divmod(pos, k)
+        row_codes[row] += row_digit[row * stride + tile] * weight[col]
+        col_codes[col] += col_digit[col * stride + tile] * weight[row]
+    conflicts = sum(table[code] for code in row_codes) + sum(table[code] for code in col_codes)
+    return manhattan_distance(tiles) + (2 * conflicts)
+
+#Incremental updates : each takes the parent's score and returns the child's score
+#after `tile` slid from flat index src to dst. `tiles` is the child board.
+def hamming_update(score, tiles, tile, src, dst, k):
+    return score - (src != tile - 1) + (dst != tile - 1)
+
+def tile_manhattan(pos, tile, k):
+    row, col = divmod(pos, k)
+    return abs(row - (tile - 1) // k) + abs(col - (tile - 1) % k)
+
+def manhattan_update(score, tiles, tile, src, dst, k):
+    return score + tile_manhattan(dst, tile, k) - tile_manhattan(src, tile, k)
+
+def tile_euclidean(pos, tile, k):
+    row, col = divmod(pos, k)
+    return math.sqrt((row - (tile - 1) // k)**2 + (col - (tile - 1) % k)**2)
+
+#not rounded per step, so the error against euclidean_distance stays below 0.0005
+def euclidean_update(score, tiles, tile, src, dst, k):
+    return score + tile_euclidean(dst, tile, k) - tile_euclidean(src, tile, k)
+
+#code of the row (along_row) or column through pos, O(k)
+def line_code(tiles, pos, k, along_row, table):
+    weight = table.weight
+    if(along_row):
+        first, step = pos - pos % k, 1
+        digit = table.row_digit
+        base = (pos // k) * table.stride
+    else:
+        first, step = pos % k, k
+        digit = table.col_digit
+        base = (pos % k) * table.stride
+    code = 0
+    for i in range(k):
+        code += digit[base + tiles[first + i * step]] * weight[i]
+    return code
+
+#a vertical slide changes the tile's row and the blank's row but not the order inside the column,
+#since the blank is skipped (a horizontal one the same with rows and columns swapped). A line's
+#code only changes if the tile belongs in it, then the line is coded again in O(k) and looked up.
+def linear_conflict_update(score, tiles, tile, src, dst, k):
+    score = manhattan_update(score, tiles, tile, src, dst, k)
+    along_row = abs(src - dst) == k
+    if(along_row):
+        goal_line, src_line, dst_line = (tile - 1) // k, src // k, dst // k
+    else:
+        goal_line, src_line, dst_line = (tile - 1) % k, src % k, dst % k
+    if(goal_line != src_line and goal_line != dst_line):
+        return score
+
+    table = conflict_table(k)
+    digit = table.row_digit if along_row else table.col_digit
+    #the tile is on the same cell of both lines, the blank's digit is k
+    place = table.weight[src % k if along_row else src // k]
+    change = (digit[goal_line * table.stride + tile] - k) * place
+    #the line the tile left : the parent had the tile on src, the child has the blank there
+    if(goal_line == src_line):
+        left = line_code(tiles, src, k, along_row, table)
+        score += 2 * (table[left] - table[left + change])
+    #the line the tile entered : the parent had the blank on dst
+    else:
+        entered = line_code(tiles, dst, k, along_row, table)
+        score += 2 * (table[entered] - table[entered - change])
+    return score
+
+#heuristics in which a move changes a single tile's term, by at most 1 : consistent, so A* never
+#has to reopen a board and every optimal solver returns a shortest path with them
+consistent_heuristics = {hamming_distance, manhattan_distance, euclidean_distance}
+
+incremental_heuristics = {
+    hamming_distance : hamming_update,
+    manhattan_distance : manhattan_update,
+    euclidean_distance : euclidean_update,
+    linear_conflict : linear_conflict_update,
+}
+
+#Score a freshly generated child, incrementally from its parent when h_n supports it
+def child_heuristic(h_n, parent, child):
+    h_update = incremental_heuristics.get(h_n)
+    if(h_update is None):
+        return h_n(child.tiles)
+    moved_tile = child.tiles[parent.blank]
+    return h_update(parent.h_value, child.tiles, moved_tile, child.blank, parent.blank, child.k)
@@ -0,0 +1,119 @@
+from PQueue import IndexedPriorityQueue
+from search_engine import PuzzleProblem, best_first_search
+import json
+import time
+
+#Effective branching factor b* : a uniform tree of depth `depth` with branching b* has
+#expanded + 1 nodes, i.e. 1 + b + b^2 + ... + b^depth = expanded + 1 (solved by bisection)
+def effective_branching_factor(expanded : int, depth : int) -> float:
+    if depth <= 0 or expanded <= 1:
+        return 0.0
+    target = expanded + 1
+    low, high = 1.0, float(expanded)
+    for _ in range(100):
+        b = (low + high) / 2
+        total = depth + 1 if b == 1 else (b ** (depth + 1) - 1) / (b - 1)
+        if total < target:
+            low = b
+        else:
+            high = b
+    return round((low + high) / 2, 4)
+
+
+#search.a_star with every phase timed : the loop is search_engine.best_first_search, run on a
+#PuzzleProblem, open list and closed set whose operations add their time to the phase they belong to.
+#stats (if a dict) receives seconds per phase, node counts, peak frontier, duplicates skipped and
+#branching factors.
+def instrumented_a_star(initial_state, h_n, max_nodes : int = None, deadline : float = None, stats : dict = None,
+                        open_list = IndexedPriorityQueue, weight : float = 1):
+    clock = time.perf_counter
+    started = clock()
+    if not(initial_state.is_solvable()):
+        return None, 0, 0
+
+    times = dict.fromkeys(["successors", "heuristic", "closed_checks", "heap"], 0.0)
+    counts = {"generated" : 0, "decrease_keys" : 0}
+    closed_sets = []
+
+    class TimedProblem(PuzzleProblem):
+        def start(self):
+            t = clock()
+            state = super().start()
+            times["heuristic"] += clock() - t
+            return state
+
+        def successors(self, state):
+            t = clock()
+            children = super().successors(state)
+            times["successors"] += clock() - t
+            counts["generated"] += len(children)
+            return children
+
+        def heuristic(self, state):
+            t = clock()
+            h = super().heuristic(state)
+            times["heuristic"] += clock() - t
+            return h
+
+    class TimedOpenList(open_list):
+        def push(self, priority, item, key):
+            counts["decrease_keys"] += open_list.__contains__(self, key)
+            t = clock()
+            super().push(priority, item, key)
+            times["heap"] += clock() - t
+
+        def pop(self):
+            t = clock()
+            entry = super().pop()
+            times["heap"] += clock() - t
+            return entry
+
+        def __contains__(self, key):
+            t = clock()
+            found = super().__contains__(key)
+            times["closed_checks"] += clock() - t
+            return found
+
+    class TimedSet(set):
+        def __init__(self):
+            super().__init__()
+            closed_sets.append(self)
+
+        def __contains__(self, key):
+            t = clock()
+            found = set.__contains__(self, key)
+            times["closed_checks"] += clock() - t
+            return found
+
+    run_stats = {}
+    path, _, explored, expanded = best_first_search(TimedProblem(initial_state, h_n), weight, False, max_nodes,
+                                                    deadline, run_stats, TimedOpenList, TimedSet)
+    total = clock() - started
+    if stats is not None:
+        depth = len(path) - 1
+        generated = counts["generated"]
+        stats.update({
+            "solution_moves" : depth,
+            "expanded" : expanded,
+            "explored" : explored,
+            "generated" : generated,
+            "duplicates_skipped" : generated - explored,
+            "decrease_keys" : counts["decrease_keys"],
+            "peak_frontier" : run_stats["peak_frontier"],
+            "closed_size" : len(closed_sets[0]),
+            "branching_factor" : round(generated / expanded, 4) if expanded else 0.0,
+            "effective_branching_factor" : effective_branching_factor(expanded, depth),
+            "time" : {
+                "total" : round(total, 6),
+                "successors" : round(times["successors"], 6),
+                "heuristic" : round(times["heuristic"], 6),
+                "closed_checks" : round(times["closed_checks"], 6),
+                "heap" : round(times["heap"], 6),
+                "other" : round(total - sum(times.values()), 6),
+            },
+            "nodes_per_second" : round(expanded / total, 1) if total else 0.0,
+        })
+    return path, explored, expanded
+
+def profile_json(stats : dict) -> str:
+    return json.dumps(stats, indent=2)
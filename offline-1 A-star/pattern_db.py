@@ -0,0 +1,182 @@
+from solvability import flatten
+from array import array
+import mmap
+import os
+
+#directory the built tables are stored in, one raw byte file per pattern
+PDB_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdb_cache")
+
+#writes a table file through a temporary file in PDB_DIR moved over path : workers building the
+#same table at once never truncate a file another one has mapped or is reading, they see the old
+#file or a complete new one
+def write_table_file(path : str, write):
+    os.makedirs(PDB_DIR, exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            write(f)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+#tiles split into disjoint groups, consecutive runs of 5 tiles on a 4x4 (5-5-5) and of 4 elsewhere.
+#Any partition works, e.g. 6-6-3, but a 6 tile table takes a long time to build in Python.
+def default_partition(k : int) -> list[list[int]]:
+    size = 5 if k == 4 else 4
+    tiles = list(range(1, k * k))
+    return [tiles[i:i + size] for i in range(0, len(tiles), size)]
+
+def cell_neighbors(k : int) -> list[list[int]]:
+    neighbors = []
+    for cell in range(k * k):
+        row, col = divmod(cell, k)
+        cells = []
+        if(row > 0):
+            cells.append(cell - k)
+        if(row < k - 1):
+            cells.append(cell + k)
+        if(col > 0):
+            cells.append(cell - 1)
+        if(col < k - 1):
+            cells.append(cell + 1)
+        neighbors.append(cells)
+    return neighbors
+
+#bitmask of the cells the blank can reach from `start` without moving a pattern tile
+def blank_region(start : int, occupied : int, neighbors : list[list[int]]) -> int:
+    region = 1 << start
+    stack = [start]
+    while stack:
+        cell = stack.pop()
+        for nei in neighbors[cell]:
+            bit = 1 << nei
+            if not(region & bit) and not(occupied & bit):
+                region |= bit
+                stack.append(nei)
+    return region
+
+
+#Pattern database for one group of tiles : table[index] is the fewest moves of the group's
+#tiles needed to bring them home, where index = sum(position of i-th tile * n**i) + blank * n**m
+#for a group of m tiles. Moves of the other tiles are free, so tables of disjoint groups can be
+#added. Every blank cell of a region the blank can reach for free holds the same value, and the
+#values are exact distances of that smaller puzzle : a move changes at most one table by at most
+#1, so the sum is consistent and A* never has to reopen a board.
+class PatternTable:
+    def __init__(self, k : int, pattern : list[int], table = None):
+        self.k = k
+        self.pattern = list(pattern)
+        self.n = k * k
+        self.table = table
+
+    def path(self) -> str:
+        return os.path.join(PDB_DIR, f"pdb_{self.k}x{self.k}_" + "-".join(map(str, self.pattern)) + ".bin")
+
+    def size(self) -> int:
+        return self.n ** (len(self.pattern) + 1)
+
+    #backward breadth first search from the goal over (group positions, blank region)
+    def build(self):
+        n = self.n
+        m = len(self.pattern)
+        neighbors = cell_neighbors(self.k)
+        weights = [n ** i for i in range(m)]
+        blank_weight = n ** m
+        #reached blank regions per group placement, one bit per region's lowest cell
+        seen = array('H' if n <= 16 else 'I' if n <= 32 else 'Q', [0]) * blank_weight
+        table = array('B', [255]) * self.size()
+
+        #depth for every blank cell of the region
+        def store(index, region, depth):
+            while region:
+                bit = region & -region
+                table[index + (bit.bit_length() - 1) * blank_weight] = depth
+                region ^= bit
+
+        positions = tuple(tile - 1 for tile in self.pattern)
+        occupied = sum(1 << pos for pos in positions)
+        region = blank_region(n - 1, occupied, neighbors)
+        index = sum(pos * weight for pos, weight in zip(positions, weights))
+        seen[index] = region & -region
+        store(index, region, 0)
+
+        frontier = [(positions, occupied, region, index)]
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for positions, occupied, region, index in frontier:
+                for i, pos in enumerate(positions):
+                    for target in neighbors[pos]:
+                        if not(region & (1 << target)):
+                            continue
+                        new_index = index + (target - pos) * weights[i]
+                        new_occupied = occupied ^ (1 << pos) ^ (1 << target)
+                        new_region = blank_region(pos, new_occupied, neighbors)
+                        rep = new_region & -new_region
+                        if(seen[new_index] & rep):
+                            continue
+                        seen[new_index] |= rep
+                        store(new_index, new_region, depth)
+                        new_positions = positions[:i] + (target,) + positions[i + 1:]
+                        next_frontier.append((new_positions, new_occupied, new_region, new_index))
+            frontier = next_frontier
+
+        self.table = table
+        return self
+
+    def save(self):
+        write_table_file(self.path(), self.table.tofile)
+
+    #maps the stored table read only, so it is shared between processes and never copied
+    def load(self) -> bool:
+        path = self.path()
+        if not(os.path.exists(path)) or os.path.getsize(path) != self.size():
+            return False
+        with open(path, "rb") as f:
+            self.table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return True
+
+    def load_or_build(self):
+        if not(self.load()):
+            self.build()
+            self.save()
+        return self
+
+    def value(self, where : list[int]) -> int:
+        index = 0
+        weight = 1
+        for tile in self.pattern:
+            index += where[tile] * weight
+            weight *= self.n
+        return self.table[index + where[0] * weight]
+
+
+#Disjoint additive pattern database : sum of the group tables
+class PatternDatabase:
+    def __init__(self, k : int, partition : list[list[int]] = None):
+        self.k = k
+        self.partition = partition if partition is not None else default_partition(k)
+        self.tables = [PatternTable(k, pattern).load_or_build() for pattern in self.partition]
+
+    def __call__(self, grid) -> int:
+        tiles, _ = flatten(grid)
+        where = [0] * len(tiles)
+        for pos, tile in enumerate(tiles):
+            where[tile] = pos
+        return sum(table.value(where) for table in self.tables)
+
+
+#one database per board size, created on first use
+_databases : dict[int, PatternDatabase] = {}
+
+#Additive Pattern Database
+def pattern_database(grid : list[list[int]]) -> int:
+    tiles, k = flatten(grid)
+    database = _databases.get(k)
+    if database is None:
+        database = PatternDatabase(k)
+        _databases[k] = database
+    return database(tiles)
@@ -0,0 +1,520 @@
+from PackedPuzzle import PackedPuzzle, goal_tiles, neighbor_table, MAX_PACKED_K
+from solvability import Unsupported
+from heuristics import child_heuristic, incremental_heuristics, consistent_heuristics
+from PQueue import PriorityQueue, IndexedPriorityQueue
+from NodeTable import NodeTable, move_offsets
+from search_engine import SearchLimitReached, check_limits, PuzzleProblem, best_first_search
+import search_engine
+import time
+
+#Every solver takes the start state (N_Puzzle or PackedPuzzle) and a heuristic and returns
+#(path, explored, expanded) where path is the list of states from start to goal,
+#or None when the puzzle is unsolvable.
+#Optional limits : max_nodes (expansions) and deadline (a time.perf_counter() value).
+#If stats is a dict it receives the peak frontier size.
+
+#for the solvers that keep boards as bytes
+def require_packed(initial_state):
+    if(initial_state.k > MAX_PACKED_K):
+        raise Unsupported(f"boards above {MAX_PACKED_K}x{MAX_PACKED_K} do not fit in bytes, use a_star or sma_star")
+
+#Construct path from nodes
+def construct_path(curr_state) -> list:
+    states_path = []
+    while curr_state.parent is not None:
+        states_path.append(curr_state)
+        curr_state = curr_state.parent
+    states_path.append(curr_state)
+    return states_path[::-1]
+
+#Rebuild the states of a path from the blank positions it visits after the start
+def replay_moves(initial_state, blank_moves : list[int]) -> list:
+    states_path = [initial_state]
+    curr_state = initial_state
+    for target in blank_moves:
+        curr_state = next(child for child in curr_state.generate_children() if child.blank == target)
+        states_path.append(curr_state)
+    return states_path
+
+#Blank moves of a path as one letter each : U(p), D(own), L(eft), R(ight)
+def move_string(states_path : list) -> str:
+    letters = dict(zip(move_offsets(states_path[0].k), "UDLR"))
+    return "".join(letters[state.blank - prev.blank] for prev, state in zip(states_path, states_path[1:]))
+
+#States of the path a move string takes from initial_state
+def replay_move_string(initial_state, moves : str) -> list:
+    offsets = dict(zip("UDLR", move_offsets(initial_state.k)))
+    blank = initial_state.blank
+    blank_moves = []
+    for move in moves:
+        blank += offsets[move]
+        blank_moves.append(blank)
+    return replay_moves(initial_state, blank_moves)
+
+
+#A* : open_list is IndexedPriorityQueue, or BucketQueue when h_n returns integers.
+#weight > 1 orders by g + weight * h (weighted A*), the path is then at most weight times optimal.
+#The loop is search_engine.best_first_search over the board as a PuzzleProblem.
+def a_star(initial_state, h_n, max_nodes : int = None, deadline : float = None, stats : dict = None,
+           open_list = IndexedPriorityQueue, weight : float = 1):
+    if not(initial_state.is_solvable()):
+        return None, 0, 0
+
+    states_path, _, explored, expanded = best_first_search(PuzzleProblem(initial_state, h_n), weight, False,
+                                                           max_nodes, deadline, stats, open_list)
+    return states_path, explored, expanded
+
+
+#Weighted A* : trades optimality for speed, the path is at most weight times the optimum
+def weighted_a_star(initial_state, h_n, max_nodes : int = None, deadline : float = None, stats : dict = None,
+                    weight : float = 2):
+    return a_star(initial_state, h_n, max_nodes, deadline, stats, weight=weight)
+
+#IDA* : depth first with an increasing f bound, one board buffer moved and unmoved in place.
+#Boards beyond MAX_PACKED_K do not fit in a bytearray and go through search_engine.ida_star.
+def ida_star(initial_state, h_n, max_nodes : int = None, deadline : float = None, stats : dict = None):
+    if not(initial_state.is_solvable()):
+        return None, 0, 0
+    if(initial_state.k > MAX_PACKED_K):
+        states_path, _, explored, expanded = search_engine.ida_star(PuzzleProblem(initial_state, h_n), max_nodes,
+                                                                    deadline, stats)
+        return states_path, explored, expanded
+
+    k = initial_state.k
+    board = bytearray(initial_state.tiles)
+    goal = goal_tiles(k)
+    neighbors = neighbor_table(k)
+    h_update = incremental_heuristics.get(h_n)
+    blank_moves = []  # blank position after each move on the current path
+    explored = 0
+    expanded = 0
+    max_depth = 0
+
+    #the board is within bound : returns None once the goal is reached, otherwise the smallest
+    #f that exceeded bound. Children over the bound are scored here and never entered.
+    def dfs(blank, prev_blank, g, h, bound):
+        nonlocal explored, expanded, max_depth
+        expanded += 1
+        if(g > max_depth):
+            max_depth = g
+        if(board == goal):
+            return None
+        check_limits(expanded, max_nodes, deadline)
+
+        next_bound = float('inf')
+        for target in neighbors[blank]:
+            #moving the blank straight back only undoes the previous move
+            if(target == prev_blank):
+                continue
+            tile = board[target]
+            board[blank] = tile
+            board[target] = 0
+            explored += 1
+            child_h = h_n(board) if h_update is None else h_update(h, board, tile, target, blank, k)
+            t = g + 1 + child_h
+            if(t <= bound):
+                blank_moves.append(target)
+                t = dfs(target, blank, g + 1, child_h, bound)
+                if(t is None):
+                    return None
+                blank_moves.pop()
+            board[target] = tile
+            board[blank] = 0
+            if(t < next_bound):
+                next_bound = t
+
+        return next_bound
+
+    h = h_n(board)
+    bound = h
+    while True:
+        t = dfs(initial_state.blank, -1, 0, h, bound)
+        if(t is None):
+            break
+        bound = t
+
+    initial_state.h_value = h
+    if stats is not None:
+        #the frontier of a depth first search is the current path
+        stats["peak_frontier"] = max_depth + 1
+    return replay_moves(initial_state, blank_moves), explored, expanded
+
+
+#pops entries that were already expanded or superseded by a cheaper copy, returns the live minimum f
+def live_min_f(pqueue, closed_set, best_g):
+    while pqueue.size() != 0:
+        priority, _, node = pqueue.heap[0]
+        if node.tiles not in closed_set and best_g[node.tiles] == node.moves_count:
+            return priority
+        pqueue.pop()
+    return float('inf')
+
+#Bidirectional A* : front to end A* from the start and from the goal, alternating on the smaller
+#open list, until the best meeting path is no longer than the smallest f on either side.
+#The backward side scores a board by relabelling every tile with the number of the goal cell it
+#occupies at the start, so the heuristics.py functions measure distance to the start unchanged.
+#Only heuristics.consistent_heuristics are accepted.
+def bidirectional_a_star(initial_state, h_n, max_nodes : int = None, deadline : float = None, stats : dict = None):
+    if not(initial_state.is_solvable()):
+        return None, 0, 0
+    require_packed(initial_state)
+
+    #the stopping test only holds when h changes by at most 1 per move
+    if h_n not in consistent_heuristics:
+        raise Unsupported("bidirectional_a_star needs a consistent heuristic : hamming, manhattan or euclidean")
+
+    k = initial_state.k
+    start = PackedPuzzle(bytes(initial_state.tiles))
+    goal = PackedPuzzle(goal_tiles(k))
+    h_update = incremental_heuristics[h_n]
+    to_start = bytearray(range(256))
+    for pos, tile in enumerate(start.tiles):
+        if tile != 0:
+            to_start[tile] = pos + 1
+    to_start = bytes(to_start)
+
+    def forward_h(parent, child):
+        return child_heuristic(h_n, parent, child)
+
+    def backward_h(parent, child):
+        relabelled = child.tiles.translate(to_start)
+        return h_update(parent.h_value, relabelled, to_start[child.tiles[parent.blank]], child.blank, parent.blank, k)
+
+    start.h_value = h_n(start.tiles)
+    goal.h_value = h_n(goal.tiles.translate(to_start))
+    sides = []
+    for root, score in ((start, forward_h), (goal, backward_h)):
+        pqueue = PriorityQueue()
+        pqueue.push(root.h_value, root)
+        sides.append((pqueue, set(), {root.tiles : 0}, {root.tiles : root}, score))
+
+    best_cost = 0 if start.tiles == goal.tiles else float('inf')
+    meeting = start.tiles
+    explored = 0
+    expanded = 0
+    peak_frontier = 2
+    while True:
+        f_forward = live_min_f(*sides[0][:3])
+        f_backward = live_min_f(*sides[1][:3])
+        if best_cost <= max(f_forward, f_backward):
+            break
+        side = 0 if sides[0][0].size() <= sides[1][0].size() else 1
+        pqueue, closed_set, best_g, nodes, score = sides[side]
+        other_best_g = sides[1 - side][2]
+
+        _, curr_state = pqueue.pop()
+        closed_set.add(curr_state.tiles)
+        expanded += 1
+        check_limits(expanded, max_nodes, deadline)
+
+        for nei_puzzle in curr_state.generate_children():
+            nei_key = nei_puzzle.tiles
+            if nei_key in closed_set or best_g.get(nei_key, nei_puzzle.moves_count + 1) <= nei_puzzle.moves_count:
+                continue
+            best_g[nei_key] = nei_puzzle.moves_count
+            nodes[nei_key] = nei_puzzle
+            nei_puzzle.h_value = score(curr_state, nei_puzzle)
+            nei_puzzle.priority = nei_puzzle.moves_count + nei_puzzle.h_value
+            pqueue.push(nei_puzzle.priority, nei_puzzle)
+            explored += 1
+            if nei_key in other_best_g and nei_puzzle.moves_count + other_best_g[nei_key] < best_cost:
+                best_cost = nei_puzzle.moves_count + other_best_g[nei_key]
+                meeting = nei_key
+        peak_frontier = max(peak_frontier, sides[0][0].size() + sides[1][0].size())
+
+    #blank positions from the start to the meeting board, then on to the goal
+    forward_half = construct_path(sides[0][3][meeting])
+    backward_half = construct_path(sides[1][3][meeting])[::-1]
+    blank_moves = [state.blank for state in forward_half[1:]] + [state.blank for state in backward_half[1:]]
+
+    if stats is not None:
+        stats["peak_frontier"] = peak_frontier
+    return replay_moves(initial_state, blank_moves), explored, expanded
+
+
+#A* over a NodeTable : the open list holds (node index, board, blank, h) and expanded boards
+#are only kept as keys of `seen`, so no N_Puzzle objects or parent chains stay alive
+def compact_a_star(initial_state, h_n, max_nodes : int = None, deadline : float = None, stats : dict = None):
+    if not(initial_state.is_solvable()):
+        return None, 0, 0
+    require_packed(initial_state)
+
+    k = initial_state.k
+    goal = goal_tiles(k)
+    neighbors = neighbor_table(k)
+    h_update = incremental_heuristics.get(h_n)
+    directions = {offset : move for move, offset in enumerate(move_offsets(k))}
+    table = NodeTable()
+    closed = bytearray()    # closed[i] : node i was expanded
+
+    root_tiles = bytes(initial_state.tiles)
+    root = table.add(-1, 0, 0)
+    closed.append(0)
+    seen = {root_tiles : root}  # board -> index of its cheapest node
+    pqueue = PriorityQueue()
+    h = h_n(root_tiles)
+    pqueue.push(h, (root, root_tiles, initial_state.blank, h))
+
+    explored = 0
+    expanded = 0
+    peak_frontier = 1
+    goal_node = None
+    while pqueue.size() != 0:
+        _, (node, tiles, blank, h) = pqueue.pop()
+        #superseded by a cheaper node for the same board
+        if closed[node] or seen[tiles] != node:
+            continue
+        closed[node] = 1
+        expanded += 1
+        if(tiles == goal):
+            goal_node = node
+            break
+        check_limits(expanded, max_nodes, deadline)
+
+        g = table.g[node] + 1
+        for target in neighbors[blank]:
+            buf = bytearray(tiles)
+            tile = buf[target]
+            buf[blank] = tile
+            buf[target] = 0
+            nei_tiles = bytes(buf)
+            old = seen.get(nei_tiles)
+            if old is not None and (closed[old] or table.g[old] <= g):
+                continue
+            nei_h = h_n(nei_tiles) if h_update is None else h_update(h, nei_tiles, tile, target, blank, k)
+            nei = table.add(node, directions[target - blank], g)
+            closed.append(0)
+            seen[nei_tiles] = nei
+            pqueue.push(g + nei_h, (nei, nei_tiles, target, nei_h))
+            explored += 1
+        peak_frontier = max(peak_frontier, pqueue.size())
+
+    if stats is not None:
+        stats["peak_frontier"] = peak_frontier
+        stats["nodes"] = len(table)
+    initial_state.h_value = h_n(initial_state.tiles)
+    return replay_moves(initial_state, table.blank_path(goal_node, initial_state.blank, k)), explored, expanded
+
+
+#ARA* : weighted A* runs with a falling weight that reuse the previous search, each one
+#publishing a better path with a suboptimality bound. Stops at weight 1 (optimal) or at the
+#deadline / node limit, returning the best path so far (SearchLimitReached if none yet).
+#stats["solutions"] lists (moves, bound, seconds) per published path; on_solution(path, bound)
+#is called as each one is found.
+def ara_star(initial_state, h_n, max_nodes : int = None, deadline : float = None, stats : dict = None,
+             weight : float = 3, weight_step : float = 0.5, on_solution = None):
+    if not(initial_state.is_solvable()):
+        return None, 0, 0
+    require_packed(initial_state)
+
+    started = time.perf_counter()
+    goal = goal_tiles(initial_state.k)
+    initial_state.h_value = h_n(initial_state.tiles)
+    start_key = bytes(initial_state.tiles)
+    nodes = {start_key : initial_state}  # board -> node holding its cheapest known path
+    open_set = {start_key}
+    closed_set = set()
+    incons = set()  # improved after being expanded in this run, reopened by the next one
+    solutions = []
+    best_path = None
+    explored = 0
+    expanded = 0
+    peak_frontier = 1
+
+    def fvalue(node):
+        return node.moves_count + weight * node.h_value
+
+    def goal_g():
+        return nodes[goal].moves_count if goal in nodes else float('inf')
+
+    def improve_path(pqueue):
+        nonlocal explored, expanded, peak_frontier
+        peak_frontier = max(peak_frontier, len(open_set))
+        while pqueue.size() != 0:
+            priority, curr_state = pqueue.heap[0][0], pqueue.heap[0][2]
+            curr_key = bytes(curr_state.tiles)
+            #stale entry : expanded already or replaced by a cheaper node
+            if curr_key not in open_set or nodes[curr_key] is not curr_state:
+                pqueue.pop()
+                continue
+            if goal_g() <= priority:
+                return
+            pqueue.pop()
+            open_set.discard(curr_key)
+            closed_set.add(curr_key)
+            expanded += 1
+            check_limits(expanded, max_nodes, deadline)
+
+            for nei_puzzle in curr_state.generate_children():
+                nei_key = bytes(nei_puzzle.tiles)
+                old = nodes.get(nei_key)
+                if old is not None and old.moves_count <= nei_puzzle.moves_count:
+                    continue
+                nei_puzzle.h_value = old.h_value if old is not None else child_heuristic(h_n, curr_state, nei_puzzle)
+                nodes[nei_key] = nei_puzzle
+                explored += 1
+                if nei_key in closed_set:
+                    incons.add(nei_key)
+                else:
+                    open_set.add(nei_key)
+                    pqueue.push(fvalue(nei_puzzle), nei_puzzle)
+            peak_frontier = max(peak_frontier, len(open_set))
+
+    #records the current path when it or its bound got better
+    def publish():
+        nonlocal best_path
+        if goal not in nodes:
+            return
+        #no path can beat the smallest g + h still waiting to be expanded
+        lower = min((nodes[key].moves_count + nodes[key].h_value for key in open_set | incons), default=goal_g())
+        bound = min(weight, goal_g() / lower) if lower > 0 else 1
+        if solutions and solutions[-1][0] <= goal_g() and solutions[-1][1] <= bound:
+            return
+        best_path = construct_path(nodes[goal])
+        solutions.append((goal_g(), bound, round(time.perf_counter() - started, 6)))
+        if on_solution is not None:
+            on_solution(best_path, bound)
+
+    try:
+        while True:
+            pqueue = PriorityQueue()
+            for key in open_set:
+                pqueue.push(fvalue(nodes[key]), nodes[key])
+            improve_path(pqueue)
+            publish()
+            if weight <= 1:
+                break
+            weight = max(1, weight - weight_step)
+            open_set |= incons
+            incons.clear()
+            closed_set.clear()
+    except SearchLimitReached:
+        if best_path is None:
+            raise
+
+    if stats is not None:
+        stats["solutions"] = solutions
+        stats["peak_frontier"] = peak_frontier
+    return best_path, explored, expanded
+
+
+#search tree node of sma_star
+class SMANode:
+    def __init__(self, state, parent : 'SMANode', f):
+        self.state = state
+        self.parent = parent
+        self.f = f
+        self.children = []
+        self.forgotten = {}     # board -> backed up f of each child dropped from memory
+        self.expanded = False
+        self.in_open = False
+        self.open_f = f         # f it was last queued with
+
+#SMA* : A* that keeps at most node_budget nodes in memory. When over budget the worst leaf
+#(highest f, shallowest) is dropped, its parent remembers its backed up f and goes back on the
+#open list with the smallest f it forgot. Expanding such a parent again regenerates only the
+#children it forgot. Finds the optimal path whenever its length is below node_budget.
+def sma_star(initial_state, h_n, max_nodes : int = None, deadline : float = None, stats : dict = None,
+             node_budget : int = 100000):
+    if not(initial_state.is_solvable()):
+        return None, 0, 0
+
+    initial_state.h_value = h_n(initial_state.tiles)
+    best_open = PriorityQueue()    # (f, -depth) : lowest f, deepest first
+    worst_leaves = PriorityQueue() # (-f, depth) : highest f, shallowest first
+
+    #a node is open while it has children to generate : never expanded, or some forgotten
+    def push_open(node):
+        node.in_open = True
+        node.open_f = min(node.forgotten.values()) if node.forgotten else node.f
+        best_open.push((node.open_f, -node.state.moves_count), node)
+        if not node.children:
+            worst_leaves.push((-node.open_f, node.state.moves_count), node)
+
+    #top of a queue after dropping entries for nodes that left the open list or were requeued
+    def top(pqueue, sign, leaves_only):
+        while pqueue.size() != 0:
+            priority, _, node = pqueue.heap[0]
+            if node.in_open and priority[0] == sign * node.open_f and not(leaves_only and node.children):
+                return node
+            pqueue.pop()
+        return None
+
+    #f of every node is the smallest f below it, children in memory or forgotten
+    def back_up(node):
+        while node is not None and (node.children or node.forgotten):
+            backed_up = min([child.f for child in node.children] + list(node.forgotten.values()))
+            if backed_up == node.f:
+                break
+            node.f = backed_up
+            node = node.parent
+
+    root = SMANode(initial_state, None, initial_state.h_value)
+    push_open(root)
+    used = 1
+    explored = 0
+    expanded = 0
+    peak_frontier = 1
+    pruned = 0
+    while True:
+        best = top(best_open, 1, False)
+        if best is None or best.open_f == float('inf'):
+            raise SearchLimitReached("node_budget")
+        if best.state.is_correct_config():
+            break
+        expanded += 1
+        check_limits(expanded, max_nodes, deadline)
+
+        best.in_open = False
+        forgotten = best.forgotten
+        first_time = not(best.expanded)
+        best.expanded = True
+        best.forgotten = {}
+        grand_parent = best.state.parent
+        for child_state in best.state.generate_children():
+            if first_time:
+                #skip the move that undoes the last one
+                if grand_parent is not None and child_state.tiles == grand_parent.tiles:
+                    continue
+                child_state.h_value = child_heuristic(h_n, best.state, child_state)
+                if child_state.moves_count >= node_budget - 1 and not child_state.is_correct_config():
+                    #a longer path could never be held in memory
+                    child_f = float('inf')
+                else:
+                    child_f = max(best.f, child_state.moves_count + child_state.h_value)
+            elif child_state.tiles in forgotten:
+                #regenerated with what was learnt about it before it was dropped
+                child_state.h_value = child_heuristic(h_n, best.state, child_state)
+                child_f = forgotten[child_state.tiles]
+            else:
+                continue
+            child = SMANode(child_state, best, child_f)
+            best.children.append(child)
+            push_open(child)
+            used += 1
+            explored += 1
+
+        if not best.children:
+            #dead end : nothing below it can reach the goal
+            best.f = float('inf')
+            push_open(best)
+        back_up(best)
+
+        while used > node_budget:
+            worst = top(worst_leaves, -1, True)
+            if worst is None or worst is root:
+                break
+            worst.in_open = False
+            parent = worst.parent
+            parent.children.remove(worst)
+            parent.forgotten[worst.state.tiles] = worst.f
+            used -= 1
+            pruned += 1
+            push_open(parent)
+
+        peak_frontier = max(peak_frontier, used)
+
+    if stats is not None:
+        stats["peak_frontier"] = peak_frontier
+        stats["pruned"] = pruned
+    return construct_path(best.state), explored, expanded
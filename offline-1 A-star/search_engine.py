@@ -0,0 +1,201 @@
+from heuristics import incremental_heuristics
+from PQueue import IndexedPriorityQueue
+import time
+
+#Search engine for any problem with the SearchProblem interface below : A*, weighted A*,
+#greedy best first and IDA*, with step costs instead of the puzzle's unit moves.
+#search.a_star and weighted_a_star run the puzzle through it with PuzzleProblem, and so does
+#search.ida_star on boards too large for its in-place bytearray loop.
+#Every search returns (path, cost, explored, expanded) where path is the list of states from
+#the start to a goal, or (None, None, explored, expanded) when no goal is reachable.
+#max_nodes / deadline raise SearchLimitReached, and stats (if a dict) receives the peak
+#frontier size.
+
+class SearchLimitReached(Exception):
+    pass
+
+def check_limits(expanded, max_nodes, deadline):
+    if max_nodes is not None and expanded > max_nodes:
+        raise SearchLimitReached("node_limit")
+    #the clock is only read every 1024 expansions
+    if deadline is not None and not(expanded & 1023) and time.perf_counter() > deadline:
+        raise SearchLimitReached("timeout")
+
+class SearchProblem:
+    def start(self):
+        raise NotImplementedError
+
+    #(next state, step cost >= 0) pairs
+    def successors(self, state) -> list[tuple]:
+        raise NotImplementedError
+
+    def is_goal(self, state) -> bool:
+        raise NotImplementedError
+
+    #hashable key, equal for states that are the same
+    def key(self, state):
+        return state
+
+    #estimate of the cheapest cost to a goal, 0 turns A* into Dijkstra
+    def heuristic(self, state) -> float:
+        return 0
+
+
+#N_Puzzle or PackedPuzzle with any h_n the puzzle solvers take. Check initial_state.is_solvable()
+#first : on an unsolvable board a search goes through half of the state space.
+class PuzzleProblem(SearchProblem):
+    def __init__(self, initial_state, h_n):
+        self.initial_state = initial_state
+        self.h_n = h_n
+        self.h_update = incremental_heuristics.get(h_n)
+
+    def start(self):
+        self.initial_state.h_value = self.h_n(self.initial_state.tiles)
+        return self.initial_state
+
+    #the parent board is always closed (A*) or on the path (IDA*), so it is not generated at all
+    def successors(self, state) -> list[tuple]:
+        parent = state.parent
+        return [(child, 1) for child in state.generate_children(-1 if parent is None else parent.blank)]
+
+    def is_goal(self, state) -> bool:
+        return state.is_correct_config()
+
+    def key(self, state):
+        return state.tiles
+
+    #children are scored from their parent's value (incremental update where there is one),
+    #as heuristics.child_heuristic does
+    def heuristic(self, state) -> float:
+        parent = state.parent
+        if parent is not None:
+            tiles = state.tiles
+            if self.h_update is None:
+                state.h_value = self.h_n(tiles)
+            else:
+                state.h_value = self.h_update(parent.h_value, tiles, tiles[parent.blank], state.blank, parent.blank, state.k)
+        return state.h_value
+
+
+def rebuild_path(nodes : dict, key) -> list:
+    path = []
+    while key is not None:
+        key, state, _ = nodes[key]
+        path.append(state)
+    return path[::-1]
+
+#Best first search ordered by g + weight * h. weight 1 is A*, weight > 1 weighted A* (cost at
+#most weight times optimal), and greedy=True orders by h alone (fast, no cost bound).
+#open_list is IndexedPriorityQueue, or BucketQueue for integer priorities on states with h_value.
+#open_list and closed_set are the classes to build them from (instrumented_search.py times them).
+def best_first_search(problem : SearchProblem, weight : float = 1, greedy : bool = False, max_nodes : int = None,
+                      deadline : float = None, stats : dict = None, open_list = IndexedPriorityQueue,
+                      closed_set = set):
+    successors, is_goal, key_of, heuristic = problem.successors, problem.is_goal, problem.key, problem.heuristic
+    start = problem.start()
+    start_key = key_of(start)
+    h = heuristic(start)
+    pqueue = open_list()  # key -> state, one live entry per open state
+    pqueue.push(h if greedy else weight * h, start, start_key)
+    nodes = {start_key : (None, start, 0)}  # key -> (parent key, state, g) on the best known path
+    closed_set = closed_set()
+    explored = 0
+    expanded = 0
+    peak_frontier = 1
+    while pqueue.size() != 0:
+        _, state = pqueue.pop()
+        key = key_of(state)
+        g = nodes[key][2]
+        closed_set.add(key)
+        expanded += 1
+        if(is_goal(state)):
+            if stats is not None:
+                stats["peak_frontier"] = peak_frontier
+            return rebuild_path(nodes, key), g, explored, expanded
+        check_limits(expanded, max_nodes, deadline)
+
+        for nei_state, cost in successors(state):
+            nei_key = key_of(nei_state)
+            if nei_key in closed_set:
+                continue
+            nei_g = g + cost
+            #already open : keep it unless this path is cheaper (decrease-key)
+            if nei_key in pqueue and nodes[nei_key][2] <= nei_g:
+                continue
+            nei_h = heuristic(nei_state)
+            pqueue.push(nei_h if greedy else nei_g + weight * nei_h, nei_state, nei_key)
+            nodes[nei_key] = (key, nei_state, nei_g)
+            explored += 1
+        peak_frontier = max(peak_frontier, pqueue.size())
+
+    if stats is not None:
+        stats["peak_frontier"] = peak_frontier
+    return None, None, explored, expanded
+
+def a_star(problem : SearchProblem, max_nodes : int = None, deadline : float = None, stats : dict = None):
+    return best_first_search(problem, 1, False, max_nodes, deadline, stats)
+
+def weighted_a_star(problem : SearchProblem, weight : float = 2, max_nodes : int = None, deadline : float = None,
+                    stats : dict = None):
+    return best_first_search(problem, weight, False, max_nodes, deadline, stats)
+
+def greedy_best_first(problem : SearchProblem, max_nodes : int = None, deadline : float = None, stats : dict = None):
+    return best_first_search(problem, 1, True, max_nodes, deadline, stats)
+
+#IDA* : depth first with an increasing f bound, keeps only the current path (cycle checked
+#by key along it). Best when the heuristic is consistent and there are few distinct costs.
+def ida_star(problem : SearchProblem, max_nodes : int = None, deadline : float = None, stats : dict = None):
+    successors, is_goal, key_of, heuristic = problem.successors, problem.is_goal, problem.key, problem.heuristic
+    start = problem.start()
+    path = [start]
+    on_path = {key_of(start)}
+    explored = 0
+    expanded = 0
+    max_depth = 0
+    cost = None
+
+    #state is within bound : returns None once a goal is reached, otherwise the smallest f
+    #that exceeded bound. Children over the bound are scored here and never entered.
+    def dfs(state, g, bound):
+        nonlocal explored, expanded, max_depth, cost
+        expanded += 1
+        if(len(path) > max_depth):
+            max_depth = len(path)
+        if(is_goal(state)):
+            cost = g
+            return None
+        check_limits(expanded, max_nodes, deadline)
+
+        next_bound = float('inf')
+        for nei_state, step_cost in successors(state):
+            nei_key = key_of(nei_state)
+            if nei_key in on_path:
+                continue
+            explored += 1
+            nei_g = g + step_cost
+            t = nei_g + heuristic(nei_state)
+            if(t <= bound):
+                path.append(nei_state)
+                on_path.add(nei_key)
+                t = dfs(nei_state, nei_g, bound)
+                if(t is None):
+                    return None
+                path.pop()
+                on_path.discard(nei_key)
+            if(t < next_bound):
+                next_bound = t
+        return next_bound
+
+    bound = heuristic(start)
+    while True:
+        t = dfs(start, 0, bound)
+        if(t is None):
+            break
+        if(t == float('inf')):
+            path = None
+            break
+        bound = t
+
+    if stats is not None:
+        stats["peak_frontier"] = max_depth
+    return path, cost, explored, expanded
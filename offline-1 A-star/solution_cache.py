@@ -0,0 +1,103 @@
+from PackedPuzzle import MAX_PACKED_K
+from search import move_string, replay_move_string
+import math
+import sqlite3
+
+#Persistent cache of solutions in a SQLite file, in front of any solver.
+#Transposing the board about the main diagonal (and renaming every tile to the one whose goal
+#cell is the mirrored one) keeps the goal in place, so a board and its mirror image share one
+#entry : the smaller of the two is stored, and a solution of one is the other's with U<->L
+#and D<->R swapped. Each entry is tagged ("optimal", or "solver/heuristic" for pairs that may
+#return longer paths) so shortest paths are never answered with anything else. The least recently used entries are evicted once the
+#file holds more than max_entries.
+
+#U<->L, D<->R : its own inverse
+TRANSPOSED_MOVES = str.maketrans("UDLR", "LRUD")
+
+def transpose_board(tiles, k : int) -> bytes:
+    mirrored = bytearray(k * k)
+    for pos, tile in enumerate(tiles):
+        row, col = divmod(pos, k)
+        if tile:
+            goal_row, goal_col = divmod(tile - 1, k)
+            tile = goal_col * k + goal_row + 1
+        mirrored[col * k + row] = tile
+    return bytes(mirrored)
+
+#(stored board, whether it is the transposed one)
+def canonical_board(tiles) -> tuple[bytes, bool]:
+    tiles = bytes(tiles)
+    mirrored = transpose_board(tiles, math.isqrt(len(tiles)))
+    return (mirrored, True) if mirrored < tiles else (tiles, False)
+
+
+class SolutionCache:
+    def __init__(self, path : str, max_entries : int = 100000, tag : str = "optimal"):
+        self.path = path
+        self.max_entries = max_entries
+        self.tag = tag
+        self.db = sqlite3.connect(path)
+        self.db.execute("CREATE TABLE IF NOT EXISTS solutions (board BLOB NOT NULL, tag TEXT NOT NULL, "
+                        "moves TEXT NOT NULL, used INTEGER NOT NULL, PRIMARY KEY (board, tag))")
+        self.db.execute("CREATE INDEX IF NOT EXISTS solutions_used ON solutions (used)")
+        self.db.commit()
+        #logical clock for the LRU order, carried on from the file
+        self.clock = self.db.execute("SELECT COALESCE(MAX(used), 0) FROM solutions").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    #move string of a cached board, None on a miss
+    def get(self, tiles) -> str:
+        board, transposed = canonical_board(tiles)
+        row = self.db.execute("SELECT moves FROM solutions WHERE board = ? AND tag = ?", (board, self.tag)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.clock += 1
+        self.db.execute("UPDATE solutions SET used = ? WHERE board = ? AND tag = ?", (self.clock, board, self.tag))
+        self.db.commit()
+        return row[0].translate(TRANSPOSED_MOVES) if transposed else row[0]
+
+    def put(self, tiles, moves : str):
+        board, transposed = canonical_board(tiles)
+        if transposed:
+            moves = moves.translate(TRANSPOSED_MOVES)
+        self.clock += 1
+        self.db.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)", (board, self.tag, moves, self.clock))
+        excess = self.db.execute("SELECT COUNT(*) FROM solutions").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.db.execute("DELETE FROM solutions WHERE rowid IN "
+                            "(SELECT rowid FROM solutions ORDER BY used LIMIT ?)", (excess,))
+            self.evictions += excess
+        self.db.commit()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits" : self.hits,
+            "misses" : self.misses,
+            "hit_rate" : round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions" : self.evictions,
+            "entries" : self.db.execute("SELECT COUNT(*) FROM solutions").fetchone()[0],
+        }
+
+    def close(self):
+        self.db.close()
+
+
+#Same result as solver(...), answered from the cache when the board (or its mirror) was solved
+#before. A cached answer reports 0 explored and 0 expanded. Boards are stored as bytes, so
+#larger ones than MAX_PACKED_K go straight to the solver.
+def cached_solve(cache : SolutionCache, initial_state, h_n, solver, max_nodes : int = None,
+                 deadline : float = None, stats : dict = None):
+    if(initial_state.k > MAX_PACKED_K):
+        return solver(initial_state, h_n, max_nodes, deadline, stats)
+    moves = cache.get(initial_state.tiles)
+    if moves is not None:
+        return replay_move_string(initial_state, moves), 0, 0
+    states_path, explored, expanded = solver(initial_state, h_n, max_nodes, deadline, stats)
+    if states_path is not None:
+        cache.put(initial_state.tiles, move_string(states_path))
+    return states_path, explored, expanded
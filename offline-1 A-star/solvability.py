@@ -0,0 +1,75 @@
+import math
+
+#Solvability from the flat board (grid, bytes, tuple or list; 0 = blank), no recursion or slicing.
+#Each move swaps the blank with a tile : it flips the parity of the board as a permutation
+#and moves the blank one step, so a board is solvable iff its permutation parity equals the
+#parity of the blank's taxicab distance to the bottom right corner.
+
+#not a board : the tiles are not each of 0 .. k*k-1 exactly once
+class InvalidBoard(ValueError):
+    pass
+
+#a valid board that a solver or heuristic can not handle (board size, or the pair of them)
+class Unsupported(ValueError):
+    pass
+
+#flat row major tiles and k of a k x k grid (list of lists) or of tiles that are flat already
+def flatten(grid) -> tuple[list[int], int]:
+    if(len(grid) and isinstance(grid[0], (list, tuple))):
+        return [item for arr in grid for item in arr], len(grid)
+    return grid, math.isqrt(len(grid))
+
+def validate_board(tiles, k : int):
+    if(k < 1 or len(tiles) != k * k or set(tiles) != set(range(k * k))):
+        raise InvalidBoard("board must hold each of 0 .. k*k-1 exactly once")
+
+#Permutation parity by cycle decomposition, O(n) : 0 even, 1 odd
+def permutation_parity(tiles) -> int:
+    n = len(tiles)
+    visited = bytearray(n)
+    cycles = 0
+    for start in range(n):
+        if visited[start]:
+            continue
+        cycles += 1
+        pos = start
+        while not visited[pos]:
+            visited[pos] = 1
+            tile = tiles[pos]
+            #cell the tile at pos belongs to, the blank belongs in the last one
+            pos = tile - 1 if tile else n - 1
+    return (n - cycles) % 2
+
+#Number of inversions with a Fenwick tree over tile values, O(n log n)
+def inversion_count(arr) -> int:
+    size = max(arr, default=0) + 1
+    tree = [0] * (size + 1)
+    inversions = 0
+    for seen, value in enumerate(arr):
+        #tiles already seen that are not larger than value
+        i = value + 1
+        not_larger = 0
+        while i > 0:
+            not_larger += tree[i]
+            i -= i & -i
+        inversions += seen - not_larger
+        i = value + 1
+        while i <= size:
+            tree[i] += 1
+            i += i & -i
+    return inversions
+
+def is_solvable_tiles(grid) -> bool:
+    tiles, k = flatten(grid)
+    if not isinstance(tiles, (bytes, bytearray, list, tuple)):
+        #NumPy rows and other sequences
+        tiles = tiles.tolist() if hasattr(tiles, "tolist") else list(tiles)
+    n = len(tiles)
+    validate_board(tiles, k)
+    row_blank, col_blank = divmod(tiles.index(0), k)
+    blank_distance = (k - 1 - row_blank) + (k - 1 - col_blank)
+    return permutation_parity(tiles) == blank_distance % 2
+
+#Screen many boards at once : any iterable of boards, including the rows of an (N, k*k) array
+def bulk_is_solvable(boards) -> list[bool]:
+    return [is_solvable_tiles(board) for board in boards]
@@ -0,0 +1,103 @@
+from N_Puzzle import N_Puzzle
+from PackedPuzzle import PackedPuzzle
+from batch_solve import heuristics_by_name, solvers_by_name, optimal_solvers, make_state
+from heuristics import consistent_heuristics
+from search import SearchLimitReached, move_string
+from solvability import InvalidBoard, Unsupported
+from solution_cache import SolutionCache, cached_solve
+import argparse
+import json
+import math
+import sys
+import time
+
+#Command line solver for files of boards, read in one go and answered in order.
+#Input formats :
+#  line : one board per line, the k*k tiles separated by spaces or commas (k from the count)
+#         e.g. "1,2,3,4,0,6,7,5,8"
+#  grid : what 2105007.py reads, k then k rows of tiles, any number of boards in a row
+#  auto : line, unless the first line is a single number
+#Output formats :
+#  moves  : "<moves> <UDLR string>" per board, letters are the directions the blank moves in
+#  boards : the same board listing as 2105007.py, every path written with a single call
+#With --cache, solved boards and their mirror images are answered from a SQLite file.
+#python solve_cli.py boards.txt --input-format line --output moves --heuristic walking_distance
+
+backends = {"packed" : PackedPuzzle, "grid" : N_Puzzle}
+
+def parse_boards(text : str, input_format : str = "auto") -> list[list[int]]:
+    lines = [line for line in text.splitlines() if line.strip()]
+    if input_format == "auto":
+        input_format = "grid" if lines and len(lines[0].replace(",", " ").split()) == 1 else "line"
+    if input_format == "line":
+        return [list(map(int, line.replace(",", " ").split())) for line in lines]
+    tokens = list(map(int, text.split()))
+    boards = []
+    i = 0
+    while i < len(tokens):
+        k = tokens[i]
+        boards.append(tokens[i + 1:i + 1 + k * k])
+        i += 1 + k * k
+    return boards
+
+#text written for one board, built as a list of pieces and joined once
+def solve_text(tiles : list[int], h_n, solver, Puzzle, output : str, max_nodes : int = None, timeout : float = None,
+               cache : SolutionCache = None) -> str:
+    deadline = time.perf_counter() + timeout if timeout is not None else None
+    try:
+        initial_state = make_state(math.isqrt(len(tiles)), tiles, Puzzle)
+        if cache is None:
+            states_path, explored, expanded = solver(initial_state, h_n, max_nodes, deadline)
+        else:
+            states_path, explored, expanded = cached_solve(cache, initial_state, h_n, solver, max_nodes, deadline)
+    except SearchLimitReached as limit:
+        return f"{limit}\n"
+    except InvalidBoard as error:
+        return f"invalid : {error}\n"
+    except Unsupported as error:
+        return f"unsupported : {error}\n"
+    if states_path is None:
+        return "unsolvable\n" if output == "moves" else "Unsolvable puzzle\n"
+    if output == "moves":
+        return f"{len(states_path) - 1} {move_string(states_path)}\n"
+    pieces = [f"\nMinimum number of moves =  {len(states_path) - 1}\n\n"]
+    pieces.extend(str(state) + '\n' for state in states_path)
+    pieces.append(f"Explored :  {explored}\nExpanded :  {expanded}\n")
+    return ''.join(pieces)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a file of N-puzzle boards")
+    parser.add_argument("input", nargs="?", default="-", help="file of boards, - for stdin")
+    parser.add_argument("--input-format", default="auto", choices=["auto", "line", "grid"])
+    parser.add_argument("--output", default="moves", choices=["moves", "boards"])
+    parser.add_argument("--heuristic", default="linear_conflict", choices=heuristics_by_name)
+    parser.add_argument("--solver", default="a_star", choices=solvers_by_name)
+    parser.add_argument("--backend", default="packed", choices=backends)
+    parser.add_argument("--timeout", type=float, default=None, help="seconds allowed per board")
+    parser.add_argument("--max-nodes", type=int, default=None, help="expansions allowed per board")
+    parser.add_argument("--cache", default=None, help="SQLite file of solutions to reuse and extend")
+    parser.add_argument("--cache-size", type=int, default=100000, help="entries kept, least recently used go first")
+    args = parser.parse_args()
+
+    if args.input == "-":
+        text = sys.stdin.read()
+    else:
+        with open(args.input) as f:
+            text = f.read()
+
+    h_n = heuristics_by_name[args.heuristic]
+    solver = solvers_by_name[args.solver]
+    #shortest paths are shared by every optimal solver with a consistent heuristic, any other pair
+    #keeps its own entries : its paths may be longer
+    cache = None
+    if args.cache is not None:
+        shortest = args.solver in optimal_solvers and h_n in consistent_heuristics
+        cache = SolutionCache(args.cache, args.cache_size, "optimal" if shortest else f"{args.solver}/{args.heuristic}")
+    out = sys.stdout
+    for tiles in parse_boards(text, args.input_format):
+        out.write(solve_text(tiles, h_n, solver, backends[args.backend], args.output, args.max_nodes, args.timeout, cache))
+    out.flush()
+    if cache is not None:
+        print(json.dumps(cache.stats()), file=sys.stderr)
+        cache.close()
@@ -0,0 +1,111 @@
+from solvability import flatten, Unsupported
+from pattern_db import PDB_DIR, write_table_file
+import os
+
+#Walking distance (Takahashi) : a board is seen as k x k counts, counts[r][g] = number of tiles
+#in row r whose goal row is g. A vertical move takes one tile from a row next to the blank's row
+#into it, whatever its column. The fewest such moves to reach the goal counts are the vertical
+#distance; the horizontal one is the same on the transposed board (goal column instead of goal
+#row), and their sum is admissible.
+#The goal is symmetric under transposition, so both halves share one table per board size.
+#The 4x4 table has 24964 count states; the 5x5 one has about 65 million, too many for a dict,
+#so sizes above 4 are not supported.
+MAX_K = 4
+
+class WalkingDistanceTable:
+    def __init__(self, k : int):
+        if k > MAX_K:
+            raise Unsupported(f"walking distance tables are only built up to {MAX_K}x{MAX_K}")
+        self.k = k
+        self.table : dict[bytes, int] = {}
+        #cell -> offset of its row in the counts, tile -> its goal row and goal column
+        self.row_base = [(pos // k) * k for pos in range(k * k)]
+        self.col_base = [(pos % k) * k for pos in range(k * k)]
+        self.goal_row = [0] + [(tile - 1) // k for tile in range(1, k * k)]
+        self.goal_col = [0] + [(tile - 1) % k for tile in range(1, k * k)]
+
+    def path(self) -> str:
+        return os.path.join(PDB_DIR, f"wd_{self.k}x{self.k}.bin")
+
+    def goal_counts(self) -> bytes:
+        k = self.k
+        counts = bytearray(k * k)
+        for row in range(k):
+            counts[row * k + row] = k
+        counts[k * k - 1] = k - 1
+        return bytes(counts)
+
+    #breadth first search from the goal counts, the blank's row is the one holding k - 1 tiles
+    def build(self):
+        k = self.k
+        goal = self.goal_counts()
+        table = {goal : 0}
+        frontier = [(goal, k - 1)]
+        depth = 0
+        while frontier:
+            depth += 1
+            next_frontier = []
+            for counts, blank_row in frontier:
+                for row in (blank_row - 1, blank_row + 1):
+                    if not(0 <= row < k):
+                        continue
+                    for goal_row in range(k):
+                        if not(counts[row * k + goal_row]):
+                            continue
+                        new_counts = bytearray(counts)
+                        new_counts[row * k + goal_row] -= 1
+                        new_counts[blank_row * k + goal_row] += 1
+                        new_counts = bytes(new_counts)
+                        if new_counts not in table:
+                            table[new_counts] = depth
+                            next_frontier.append((new_counts, row))
+            frontier = next_frontier
+        self.table = table
+        return self
+
+    #fixed width records : the k*k counts then the distance byte
+    def save(self):
+        def write(f):
+            for counts, distance in self.table.items():
+                f.write(counts + bytes((distance,)))
+        write_table_file(self.path(), write)
+
+    def load(self) -> bool:
+        path = self.path()
+        size = self.k * self.k + 1
+        if not(os.path.exists(path)) or os.path.getsize(path) % size:
+            return False
+        with open(path, "rb") as f:
+            data = f.read()
+        self.table = {data[i:i + size - 1] : data[i + size - 1] for i in range(0, len(data), size)}
+        return len(self.table) > 0
+
+    def load_or_build(self):
+        if not(self.load()):
+            self.build()
+            self.save()
+        return self
+
+    def __call__(self, tiles) -> int:
+        vertical = bytearray(self.k * self.k)
+        horizontal = bytearray(self.k * self.k)
+        row_base, col_base = self.row_base, self.col_base
+        goal_row, goal_col = self.goal_row, self.goal_col
+        for pos, tile in enumerate(tiles):
+            if tile:
+                vertical[row_base[pos] + goal_row[tile]] += 1
+                horizontal[col_base[pos] + goal_col[tile]] += 1
+        return self.table[bytes(vertical)] + self.table[bytes(horizontal)]
+
+
+#one table per board size, loaded or built on first use
+_tables : dict[int, WalkingDistanceTable] = {}
+
+#Walking Distance
+def walking_distance(grid : list[list[int]]) -> int:
+    tiles, k = flatten(grid)
+    table = _tables.get(k)
+    if table is None:
+        table = WalkingDistanceTable(k).load_or_build()
+        _tables[k] = table
+    return table(tiles)